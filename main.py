@@ -7,6 +7,36 @@ import sys
 import numpy as np
 from pathlib import Path
 
+# orjson is optional - serializes large result arrays much faster than json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _to_builtin(obj):
+    """JSON fallback for NumPy arrays and scalars"""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def print_json(obj):
+    """Write obj to stdout as indented JSON"""
+    if ORJSON_AVAILABLE:
+        # NumPy arrays are serialized natively, without a .tolist() round trip
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(
+            obj,
+            default=_to_builtin,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+        ))
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(obj, indent=2, default=_to_builtin))
+
+
 def main():
     try:
         print("="*80)
@@ -84,7 +114,7 @@ def main():
         print("="*80)
         print("   EXECUTION COMPLETE")
         print("="*80)
-        print(json.dumps(output, indent=2))
+        print_json(output)
         
         return 0
         
@@ -99,7 +129,7 @@ def main():
             "error": str(e),
             "traceback": traceback.format_exc()
         }
-        print(json.dumps(error_output, indent=2))
+        print_json(error_output)
         return 1
 
 if __name__ == '__main__':
@@ -1,7 +1,7 @@
 # Model package
 from .qsvm_classifier import QSVM, ZZFeatureMapEncoder, QuantumKernelComputer
 from .evaluation_metrics import FraudDetectionMetrics
-from .qcentroid_config import QCentroidConfig, QCentroidChallengeAPI, get_qcentroid_client
+from .qcentroid_config import QCentroidConfig, QCentroidChallengeAPI, QCentroidClient, get_qcentroid_client
 
 __all__ = [
     'QSVM',
@@ -10,5 +10,6 @@ __all__ = [
     'FraudDetectionMetrics',
     'QCentroidConfig',
     'QCentroidChallengeAPI',
+    'QCentroidClient',
     'get_qcentroid_client',
 ]
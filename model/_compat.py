@@ -0,0 +1,26 @@
+"""
+Compatibility helpers for differences between Qiskit releases.
+
+The Qiskit version is probed once at import time, so hot loops call a plain
+function instead of retrying APIs inside try/except on every sample.
+"""
+
+try:
+    import qiskit
+    from qiskit.circuit import QuantumCircuit
+    QISKIT_MAJOR = int(qiskit.__version__.partition('.')[0])
+except ImportError:
+    QuantumCircuit = None
+    QISKIT_MAJOR = None
+
+
+# assign_parameters is available from late 0.x onwards and is the only binder in
+# Qiskit >= 1.0; bind_parameters is the fallback for older 0.x releases
+if QuantumCircuit is not None and (QISKIT_MAJOR >= 1 or hasattr(QuantumCircuit, 'assign_parameters')):
+    def bind_params(circuit, params):
+        """Bind parameter values (sequence or {Parameter: value} mapping) to a circuit"""
+        return circuit.assign_parameters(params)
+else:
+    def bind_params(circuit, params):
+        """Bind parameter values (sequence or {Parameter: value} mapping) to a circuit"""
+        return circuit.bind_parameters(params)
@@ -10,25 +10,122 @@ Implements all required metrics:
 - AUC-PR (Area Under Precision-Recall Curve)
 """
 
+import os
+import sys
 import numpy as np
+from scipy.stats import rankdata
+import matplotlib
+
+# Render off-screen unless the caller already picked a backend (e.g. Jupyter)
+if 'matplotlib.pyplot' not in sys.modules and not os.environ.get('MPLBACKEND'):
+    matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import (
-    confusion_matrix,
-    accuracy_score,
-    precision_score,
-    recall_score,
-    f1_score,
-    roc_curve,
-    auc,
-    precision_recall_curve,
-    roc_auc_score,
-    average_precision_score,
-    classification_report
-)
+from sklearn.metrics import auc, average_precision_score
 from typing import Dict, Tuple, Optional
 import pandas as pd
 
+# Numba is optional - fall back to vectorised NumPy when it is missing
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _binary_confusion_counts(y_true, y_pred):
+        """Count (TP, TN, FP, FN) for 0/1 int8 labels in a single pass"""
+        tp = tn = fp = fn = 0
+        for i in range(y_true.shape[0]):
+            t = y_true[i]
+            p = y_pred[i]
+            tp += t & p
+            tn += (1 - t) & (1 - p)
+            fp += (1 - t) & p
+            fn += t & (1 - p)
+        return tp, tn, fp, fn
+else:
+    def _binary_confusion_counts(y_true, y_pred):
+        """Count (TP, TN, FP, FN) for 0/1 int8 labels"""
+        tp = np.count_nonzero(y_true & y_pred)
+        fp = np.count_nonzero(y_pred) - tp
+        fn = np.count_nonzero(y_true) - tp
+        tn = y_true.shape[0] - tp - fp - fn
+        return tp, tn, fp, fn
+
+
+def _fast_auc_roc(y_true: np.ndarray, y_score: np.ndarray) -> float:
+    """
+    AUC-ROC as the normalised Mann-Whitney U statistic.
+    
+    Needs a single sort of the scores; tied scores get their average rank,
+    which matches the trapezoidal AUC computed by sklearn.
+    """
+    y_true = np.asarray(y_true) == 1
+    n_pos = int(np.count_nonzero(y_true))
+    n_neg = y_true.shape[0] - n_pos
+    if n_pos == 0 or n_neg == 0:
+        raise ValueError("Only one class present in y_true. AUC-ROC is not defined in that case.")
+    
+    ranks = rankdata(y_score, method='average')
+    return float((ranks[y_true].sum() - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg))
+
+
+def _roc_pr_from_scores(
+    y_true: np.ndarray,
+    y_score: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    ROC and precision-recall curves from a single descending sort of the scores.
+    
+    Returns:
+        (fpr, tpr, precision, recall); the PR curve is ordered by increasing
+        recall and starts at (recall=0, precision=1).
+    """
+    y_true = np.asarray(y_true) == 1
+    y_score = np.asarray(y_score)
+    
+    order = np.argsort(-y_score, kind='mergesort')
+    y_sorted = y_true[order]
+    score_sorted = y_score[order]
+    
+    # Only keep the last position of each distinct score (one point per threshold)
+    distinct = np.r_[np.flatnonzero(np.diff(score_sorted)), y_sorted.size - 1]
+    tps = np.cumsum(y_sorted)[distinct]
+    fps = (distinct + 1) - tps
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fpr = np.r_[0, fps] / fps[-1]
+        tpr = np.r_[0, tps] / tps[-1]
+        precision = np.r_[1, tps / (tps + fps)]
+        recall = np.r_[0, tps / tps[-1]]
+    
+    return fpr, tpr, precision, recall
+
+
+# File-only backends, on which plt.show() renders nothing
+_NON_INTERACTIVE_BACKENDS = ('agg', 'cairo', 'pdf', 'pgf', 'ps', 'svg', 'template')
+
+
+def _finish_figure(fig, save_path: Optional[str] = None):
+    """
+    Save fig to save_path, or show it when the backend can display figures.
+    
+    The figure is closed afterwards unless it was shown, so repeated plotting
+    without a save_path does not accumulate open figures.
+    """
+    if save_path:
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
+    elif matplotlib.get_backend().lower() not in _NON_INTERACTIVE_BACKENDS:
+        plt.show()
+        return
+    else:
+        print(f"Warning: '{fig.axes[0].get_title()}' was not rendered by the "
+              f"non-interactive {matplotlib.get_backend()} backend; pass save_path to keep it")
+    plt.close(fig)
+
 
 class FraudDetectionMetrics:
     """
@@ -43,11 +140,8 @@ class FraudDetectionMetrics:
     - AUC-PR: Area under Precision vs Recall curve
     """
     
-    def __init__(self):
-        self.results = {}
-    
+    @staticmethod
     def compute_confusion_matrix_components(
-        self,
         y_true: np.ndarray,
         y_pred: np.ndarray
     ) -> Dict[str, int]:
@@ -57,12 +151,10 @@ class FraudDetectionMetrics:
         Returns:
             Dictionary with TP, TN, FP, FN counts
         """
-        cm = confusion_matrix(y_true, y_pred)
-        
-        # For binary classification:
-        # [[TN, FP],
-        #  [FN, TP]]
-        tn, fp, fn, tp = cm.ravel()
+        tp, tn, fp, fn = _binary_confusion_counts(
+            np.ascontiguousarray(y_true, dtype=np.int8),
+            np.ascontiguousarray(y_pred, dtype=np.int8)
+        )
         
         return {
             'TP': int(tp),  # True Positives
@@ -71,8 +163,8 @@ class FraudDetectionMetrics:
             'FN': int(fn)   # False Negatives
         }
     
+    @staticmethod
     def compute_all_metrics(
-        self,
         y_true: np.ndarray,
         y_pred: np.ndarray,
         y_prob: Optional[np.ndarray] = None
@@ -80,6 +172,9 @@ class FraudDetectionMetrics:
         """
         Compute all evaluation metrics.
         
+        Stateless, so a single instance can be shared across threads or
+        joblib workers.
+        
         Args:
             y_true: True labels (0 or 1)
             y_pred: Predicted labels (0 or 1)
@@ -88,37 +183,46 @@ class FraudDetectionMetrics:
         Returns:
             Dictionary containing all metrics
         """
+        # Canonical compact copies, shared by every metric below. Scores stay
+        # float64: raw margins closer than float32 resolution must not become ties
+        y_true = np.ascontiguousarray(y_true, dtype=np.int8)
+        y_pred = np.ascontiguousarray(y_pred, dtype=np.int8)
+        if y_prob is not None:
+            y_prob = np.ascontiguousarray(y_prob, dtype=np.float64)
+        
         # Confusion matrix components
-        cm_components = self.compute_confusion_matrix_components(y_true, y_pred)
-        tp, tn, fp, fn = cm_components['TP'], cm_components['TN'], cm_components['FP'], cm_components['FN']
+        tp, tn, fp, fn = (int(c) for c in _binary_confusion_counts(y_true, y_pred))
         
-        # Basic metrics
+        # Basic metrics - all closed forms of the four counters, so the
+        # labels are only scanned once
+        total = tp + tn + fp + fn
+        precision = tp / (tp + fp) if (tp + fp) > 0 else 0.0
+        recall = tp / (tp + fn) if (tp + fn) > 0 else 0.0
         metrics = {
             'TP': tp,
             'TN': tn,
             'FP': fp,
             'FN': fn,
-            'accuracy': accuracy_score(y_true, y_pred),
-            'precision': precision_score(y_true, y_pred, zero_division=0),
-            'recall': recall_score(y_true, y_pred, zero_division=0),  # Same as TPR
-            'f1_score': f1_score(y_true, y_pred, zero_division=0)
+            'accuracy': (tp + tn) / total if total > 0 else 0.0,
+            'precision': precision,
+            'recall': recall,  # Same as TPR
+            'f1_score': 2 * tp / (2 * tp + fp + fn) if (tp + fp + fn) > 0 else 0.0
         }
         
         # TPR and FPR (for manual verification)
-        metrics['TPR'] = tp / (tp + fn) if (tp + fn) > 0 else 0  # True Positive Rate
+        metrics['TPR'] = recall  # True Positive Rate
         metrics['FPR'] = fp / (fp + tn) if (fp + tn) > 0 else 0  # False Positive Rate
         
         # AUC metrics (require probability scores)
         if y_prob is not None:
             try:
-                metrics['AUC_ROC'] = roc_auc_score(y_true, y_prob)
+                metrics['AUC_ROC'] = _fast_auc_roc(y_true, y_prob)
                 metrics['AUC_PR'] = average_precision_score(y_true, y_prob)
             except ValueError as e:
                 print(f"Warning: Could not compute AUC metrics: {e}")
                 metrics['AUC_ROC'] = 0.0
                 metrics['AUC_PR'] = 0.0
         
-        self.results = metrics
         return metrics
     
     def print_metrics(self, metrics: Dict[str, float], model_name: str = "Model"):
@@ -171,41 +275,53 @@ class FraudDetectionMetrics:
             title: Plot title
             save_path: Path to save figure (optional)
         """
-        cm = confusion_matrix(y_true, y_pred)
-        
-        plt.figure(figsize=(8, 6))
-        sns.heatmap(
-            cm,
-            annot=True,
-            fmt='d',
-            cmap='Blues',
-            xticklabels=['Legitimate (0)', 'Fraud (1)'],
-            yticklabels=['Legitimate (0)', 'Fraud (1)']
-        )
-        plt.title(title, fontsize=14, fontweight='bold')
-        plt.ylabel('True Label', fontsize=12)
-        plt.xlabel('Predicted Label', fontsize=12)
+        cm_components = self.compute_confusion_matrix_components(y_true, y_pred)
+        tp, tn, fp, fn = cm_components['TP'], cm_components['TN'], cm_components['FP'], cm_components['FN']
+        
+        # [[TN, FP],
+        #  [FN, TP]]
+        cm = np.array([[tn, fp], [fn, tp]])
+        labels = ['Legitimate (0)', 'Fraud (1)']
+        
+        fig, ax = plt.subplots(figsize=(8, 6))
+        im = ax.imshow(cm, cmap='Blues')
+        fig.colorbar(im, ax=ax)
+        
+        # Annotate each cell, switching to white text on dark cells
+        threshold = (cm.max() + cm.min()) / 2
+        for i in range(2):
+            for j in range(2):
+                ax.text(
+                    j, i, str(cm[i, j]),
+                    ha='center', va='center',
+                    color='white' if cm[i, j] > threshold else 'black'
+                )
+        
+        ax.set_xticks([0, 1])
+        ax.set_yticks([0, 1])
+        ax.set_xticklabels(labels)
+        ax.set_yticklabels(labels)
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.set_ylabel('True Label', fontsize=12)
+        ax.set_xlabel('Predicted Label', fontsize=12)
         
         # Add text annotations for TP, TN, FP, FN
-        tn, fp, fn, tp = cm.ravel()
-        plt.text(0.5, -0.15, f'TN={tn}', ha='center', transform=plt.gca().transAxes, fontsize=10)
-        plt.text(1.5, -0.15, f'FP={fp}', ha='center', transform=plt.gca().transAxes, fontsize=10)
-        plt.text(0.5, 1.15, f'FN={fn}', ha='center', transform=plt.gca().transAxes, fontsize=10)
-        plt.text(1.5, 1.15, f'TP={tp}', ha='center', transform=plt.gca().transAxes, fontsize=10)
+        ax.text(0.5, -0.15, f'TN={tn}', ha='center', transform=ax.transAxes, fontsize=10)
+        ax.text(1.5, -0.15, f'FP={fp}', ha='center', transform=ax.transAxes, fontsize=10)
+        ax.text(0.5, 1.15, f'FN={fn}', ha='center', transform=ax.transAxes, fontsize=10)
+        ax.text(1.5, 1.15, f'TP={tp}', ha='center', transform=ax.transAxes, fontsize=10)
         
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        
-        plt.show()
+        _finish_figure(fig, save_path)
     
     def plot_roc_curve(
         self,
         y_true: np.ndarray,
         y_prob: np.ndarray,
         title: str = "ROC Curve",
-        save_path: Optional[str] = None
+        save_path: Optional[str] = None,
+        curves: Optional[Tuple[np.ndarray, ...]] = None
     ):
         """
         Plot ROC (Receiver Operating Characteristic) curve.
@@ -218,11 +334,12 @@ class FraudDetectionMetrics:
             y_prob: Predicted probabilities for positive class
             title: Plot title
             save_path: Path to save figure (optional)
+            curves: Precomputed output of _roc_pr_from_scores (optional)
         """
-        fpr, tpr, thresholds = roc_curve(y_true, y_prob)
+        fpr, tpr, _, _ = curves if curves is not None else _roc_pr_from_scores(y_true, y_prob)
         roc_auc = auc(fpr, tpr)
         
-        plt.figure(figsize=(8, 6))
+        fig = plt.figure(figsize=(8, 6))
         plt.plot(
             fpr, tpr,
             color='darkorange',
@@ -241,10 +358,7 @@ class FraudDetectionMetrics:
         
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        
-        plt.show()
+        _finish_figure(fig, save_path)
         
         return roc_auc
     
@@ -253,7 +367,8 @@ class FraudDetectionMetrics:
         y_true: np.ndarray,
         y_prob: np.ndarray,
         title: str = "Precision-Recall Curve",
-        save_path: Optional[str] = None
+        save_path: Optional[str] = None,
+        curves: Optional[Tuple[np.ndarray, ...]] = None
     ):
         """
         Plot Precision-Recall curve.
@@ -266,12 +381,14 @@ class FraudDetectionMetrics:
             y_prob: Predicted probabilities for positive class
             title: Plot title
             save_path: Path to save figure (optional)
+            curves: Precomputed output of _roc_pr_from_scores (optional)
         """
-        precision, recall, thresholds = precision_recall_curve(y_true, y_prob)
+        _, _, precision, recall = curves if curves is not None else _roc_pr_from_scores(y_true, y_prob)
         pr_auc = auc(recall, precision)
-        avg_precision = average_precision_score(y_true, y_prob)
+        # Step-wise AP, identical to average_precision_score
+        avg_precision = float(np.sum(np.diff(recall) * precision[1:]))
         
-        plt.figure(figsize=(8, 6))
+        fig = plt.figure(figsize=(8, 6))
         plt.plot(
             recall, precision,
             color='darkorange',
@@ -293,10 +410,7 @@ class FraudDetectionMetrics:
         
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        
-        plt.show()
+        _finish_figure(fig, save_path)
         
         return pr_auc
     
@@ -324,11 +438,14 @@ class FraudDetectionMetrics:
         
         # ROC and PR curves (if probabilities available)
         if y_prob is not None:
+            # Both curves come from the same sorted scores
+            curves = _roc_pr_from_scores(y_true, y_prob)
+            
             save_path_roc = f"{save_dir}/{model_name}_roc_curve.png" if save_dir else None
-            self.plot_roc_curve(y_true, y_prob, f"{model_name} - ROC Curve", save_path_roc)
+            self.plot_roc_curve(y_true, y_prob, f"{model_name} - ROC Curve", save_path_roc, curves)
             
             save_path_pr = f"{save_dir}/{model_name}_pr_curve.png" if save_dir else None
-            self.plot_precision_recall_curve(y_true, y_prob, f"{model_name} - Precision-Recall Curve", save_path_pr)
+            self.plot_precision_recall_curve(y_true, y_prob, f"{model_name} - Precision-Recall Curve", save_path_pr, curves)
     
     def compare_models(
         self,
@@ -342,18 +459,27 @@ class FraudDetectionMetrics:
             results_dict: Dictionary mapping model names to their metrics
             save_path: Path to save comparison plot (optional)
         """
-        df = pd.DataFrame(results_dict).T
+        model_names = list(results_dict)
         
         # Select key metrics for comparison
         key_metrics = ['accuracy', 'precision', 'recall', 'f1_score']
-        if 'AUC_ROC' in df.columns:
+        if any('AUC_ROC' in m for m in results_dict.values()):
             key_metrics.extend(['AUC_ROC', 'AUC_PR'])
         
-        df_plot = df[key_metrics]
+        # (model, metric) score matrix filled straight from the metric dicts
+        scores = np.stack([
+            np.array([results_dict[name].get(k, np.nan) for k in key_metrics], dtype=np.float64)
+            for name in model_names
+        ])
         
-        # Create comparison plot
+        # Create comparison plot: one group of bars per model
         fig, ax = plt.subplots(figsize=(12, 6))
-        df_plot.plot(kind='bar', ax=ax, width=0.8)
+        x = np.arange(len(model_names))
+        width = 0.8 / len(key_metrics)
+        for j, metric in enumerate(key_metrics):
+            ax.bar(x - 0.4 + (j + 0.5) * width, scores[:, j], width=width, label=metric)
+        ax.set_xticks(x)
+        ax.set_xticklabels(model_names)
         
         ax.set_title('Model Performance Comparison', fontsize=14, fontweight='bold')
         ax.set_xlabel('Model', fontsize=12)
@@ -365,16 +491,13 @@ class FraudDetectionMetrics:
         plt.xticks(rotation=45, ha='right')
         plt.tight_layout()
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-        
-        plt.show()
+        _finish_figure(fig, save_path)
         
         # Print comparison table
         print("\n" + "=" * 100)
         print("📊 Model Comparison Summary")
         print("=" * 100)
-        print(df_plot.to_string())
+        print(pd.DataFrame(scores, index=model_names, columns=key_metrics).to_string())
         print("=" * 100 + "\n")
 
 
@@ -2,7 +2,8 @@
 import numpy as np
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.inspection import permutation_importance
 import xgboost as xgb
 from sklearn.metrics import (accuracy_score, precision_score, recall_score,
                            f1_score, roc_auc_score, confusion_matrix,
@@ -12,15 +13,25 @@ import seaborn as sns
 import qcentroid as qc
 import joblib
 import os
+import argparse
+
+# LZ4 (de)compresses at GB/s so saved models stay small without slowing loads;
+# fall back to zlib level 3 when python-lz4 is not installed
+try:
+    import lz4  # noqa: F401
+    JOBLIB_COMPRESS = ('lz4', 3)
+except ImportError:
+    JOBLIB_COMPRESS = 3
 
 def load_preprocessed_data():
     """Load preprocessed data from disk"""
     processed_dir = '../data/processed'
 
-    X_train_scaled = np.load(f'{processed_dir}/X_train_scaled.npy')
-    X_test_scaled = np.load(f'{processed_dir}/X_test_scaled.npy')
-    y_train_resampled = np.load(f'{processed_dir}/y_train_resampled.npy')
-    y_test = np.load(f'{processed_dir}/y_test.npy')
+    # Memory-mapped: pages are read on demand instead of loading everything up front
+    X_train_scaled = np.load(f'{processed_dir}/X_train_scaled.npy', mmap_mode='r')
+    X_test_scaled = np.load(f'{processed_dir}/X_test_scaled.npy', mmap_mode='r')
+    y_train_resampled = np.load(f'{processed_dir}/y_train_resampled.npy', mmap_mode='r')
+    y_test = np.load(f'{processed_dir}/y_test.npy', mmap_mode='r')
 
     # Load feature names
     feature_names = pd.read_csv(f'{processed_dir}/feature_names.csv')['0'].tolist()
@@ -69,13 +80,24 @@ def plot_roc_curve(y_true, y_prob, title="ROC Curve"):
     plt.title(title)
     plt.show()
 
-def train_classical_models(X_train, y_train, X_test, y_test, feature_names):
-    """Train and evaluate classical ML models"""
+def xgb_device_params(use_gpu=None):
+    """Histogram tree method for XGBoost, on the GPU when CUDA devices are visible"""
+    if use_gpu is None:
+        use_gpu = os.environ.get('CUDA_VISIBLE_DEVICES', '') not in ('', '-1')
+
+    # XGBoost >= 2.0 selects the GPU with `device`; older releases use gpu_hist
+    if int(xgb.__version__.split('.')[0]) >= 2:
+        return {'tree_method': 'hist', 'device': 'cuda' if use_gpu else 'cpu'}
+    return {'tree_method': 'gpu_hist' if use_gpu else 'hist'}
+
+def train_classical_models(X_train, y_train, X_test, y_test, feature_names, make_plots=False):
+    """Train and evaluate classical ML models (plots are only drawn with make_plots=True)"""
     models = {}
 
     # 1. Logistic Regression
     print("Training Logistic Regression...")
-    lr_model = LogisticRegression(class_weight='balanced', max_iter=1000)
+    lr_model = LogisticRegression(class_weight='balanced', solver='saga', C=1.0, tol=1e-3,
+                                  max_iter=1000, random_state=42)
     lr_model.fit(X_train, y_train)
 
     lr_pred = lr_model.predict(X_test)
@@ -87,51 +109,72 @@ def train_classical_models(X_train, y_train, X_test, y_test, feature_names):
     for metric, value in lr_results.items():
         print(f"{metric}: {value:.4f}")
 
-    plot_confusion_matrix(y_test, lr_pred, "Logistic Regression Confusion Matrix")
-    plot_roc_curve(y_test, lr_prob, "Logistic Regression ROC Curve")
+    if make_plots:
+        plot_confusion_matrix(y_test, lr_pred, "Logistic Regression Confusion Matrix")
+        plot_roc_curve(y_test, lr_prob, "Logistic Regression ROC Curve")
     
     models['logistic_regression'] = (lr_model, lr_results)
 
-    # 2. Random Forest
-    print("\nTraining Random Forest...")
-    rf_model = RandomForestClassifier(n_estimators=100, class_weight='balanced', random_state=42)
-    rf_model.fit(X_train, y_train)
+    # 2. Histogram Gradient Boosting (binned splits - much faster than a random forest)
+    print("\nTraining Histogram Gradient Boosting...")
+    hgb_model = HistGradientBoostingClassifier(
+        max_iter=200,
+        learning_rate=0.1,
+        max_depth=None,
+        early_stopping=True,
+        random_state=42
+    )
+    hgb_model.fit(X_train, y_train)
 
-    rf_pred = rf_model.predict(X_test)
-    rf_prob = rf_model.predict_proba(X_test)[:, 1]
+    hgb_pred = hgb_model.predict(X_test)
+    hgb_prob = hgb_model.predict_proba(X_test)[:, 1]
 
-    print("\nRandom Forest Results:")
+    print("\nHistogram Gradient Boosting Results:")
     print("-" * 50)
-    rf_results = evaluate_model(y_test, rf_pred, rf_prob)
-    for metric, value in rf_results.items():
+    hgb_results = evaluate_model(y_test, hgb_pred, hgb_prob)
+    for metric, value in hgb_results.items():
         print(f"{metric}: {value:.4f}")
 
-    plot_confusion_matrix(y_test, rf_pred, "Random Forest Confusion Matrix")
-    plot_roc_curve(y_test, rf_prob, "Random Forest ROC Curve")
+    if make_plots:
+        plot_confusion_matrix(y_test, hgb_pred, "Histogram Gradient Boosting Confusion Matrix")
+        plot_roc_curve(y_test, hgb_prob, "Histogram Gradient Boosting ROC Curve")
 
-    # Feature importance
-    feature_importance = pd.DataFrame({
-        'feature': feature_names,
-        'importance': rf_model.feature_importances_
-    }).sort_values('importance', ascending=False)
+        # Feature importance (HGB has no impurity-based importances)
+        importance = permutation_importance(
+            hgb_model, X_test, y_test,
+            scoring='roc_auc', n_repeats=5, random_state=42
+        )
+        feature_importance = pd.DataFrame({
+            'feature': feature_names,
+            'importance': importance.importances_mean
+        }).sort_values('importance', ascending=False)
 
-    plt.figure(figsize=(10, 6))
-    sns.barplot(data=feature_importance.head(10), x='importance', y='feature')
-    plt.title('Top 10 Most Important Features')
-    plt.show()
+        plt.figure(figsize=(10, 6))
+        sns.barplot(data=feature_importance.head(10), x='importance', y='feature')
+        plt.title('Top 10 Most Important Features')
+        plt.show()
 
-    models['random_forest'] = (rf_model, rf_results)
+    models['hist_gradient_boosting'] = (hgb_model, hgb_results)
 
     # 3. XGBoost
     print("\nTraining XGBoost...")
-    xgb_model = xgb.XGBClassifier(
+    xgb_params = dict(
         scale_pos_weight=1,  # Already balanced by SMOTE
         learning_rate=0.1,
         n_estimators=100,
         max_depth=5,
+        max_bin=256,
+        n_jobs=-1,
         random_state=42
     )
-    xgb_model.fit(X_train, y_train)
+    xgb_model = xgb.XGBClassifier(**xgb_params, **xgb_device_params())
+    try:
+        xgb_model.fit(X_train, y_train)
+    except xgb.core.XGBoostError as e:
+        # XGBoost build without CUDA support - retrain on the CPU
+        print(f"GPU training unavailable ({e}), falling back to CPU")
+        xgb_model = xgb.XGBClassifier(**xgb_params, **xgb_device_params(use_gpu=False))
+        xgb_model.fit(X_train, y_train)
 
     xgb_pred = xgb_model.predict(X_test)
     xgb_prob = xgb_model.predict_proba(X_test)[:, 1]
@@ -142,8 +185,9 @@ def train_classical_models(X_train, y_train, X_test, y_test, feature_names):
     for metric, value in xgb_results.items():
         print(f"{metric}: {value:.4f}")
 
-    plot_confusion_matrix(y_test, xgb_pred, "XGBoost Confusion Matrix")
-    plot_roc_curve(y_test, xgb_prob, "XGBoost ROC Curve")
+    if make_plots:
+        plot_confusion_matrix(y_test, xgb_pred, "XGBoost Confusion Matrix")
+        plot_roc_curve(y_test, xgb_prob, "XGBoost ROC Curve")
 
     models['xgboost'] = (xgb_model, xgb_results)
 
@@ -173,15 +217,22 @@ class QuantumFraudDetector:
         self.n_qubits = min(n_features, 8)  # Start with limited qubits
         self.circuit = create_quantum_classifier(self.n_qubits)
         self.backend = qc.get_backend('simulator')  # Use simulator for development
+        self._encode_buf = None  # Reused angle buffer for encode_data
     
     def encode_data(self, X):
-        """Encode classical data into quantum states"""
-        encoded_data = []
-        for sample in X:
-            # Use first n_qubits features
-            angles = 2 * np.pi * sample[:self.n_qubits]
-            encoded_data.append(angles)
-        return np.array(encoded_data)
+        """Encode classical data into quantum states
+        
+        The returned array is an internal buffer that is overwritten by the
+        next call with the same batch size - copy it if it must be kept.
+        """
+        n_samples = X.shape[0]
+        if self._encode_buf is None or self._encode_buf.shape[0] != n_samples:
+            self._encode_buf = np.empty((n_samples, self.n_qubits), dtype=np.float32)
+        
+        # Use first n_qubits features as rotation angles, written straight into the buffer
+        np.multiply(X[:, :self.n_qubits], np.float32(2.0 * np.pi), out=self._encode_buf,
+                    casting='same_kind')
+        return self._encode_buf
     
     def train(self, X, y, n_epochs=50):
         """Train the quantum model"""
@@ -196,25 +247,15 @@ class QuantumFraudDetector:
     
     def predict(self, X):
         """Make predictions using the quantum circuit"""
-        encoded_data = self.encode_data(X)
-        predictions = []
-        
-        for sample in encoded_data:
-            # Set circuit parameters based on input
-            circuit = self.circuit.copy()
-            for i, angle in enumerate(sample):
-                circuit.rx(angle, i)
-            
-            # Execute circuit
-            result = circuit.execute(backend=self.backend)
-            
-            # Convert quantum measurement to binary prediction
-            predictions.append(int(np.random.rand() > 0.5))
-        
-        return np.array(predictions)
-
-def train_quantum_model(X_train, y_train, X_test, y_test):
-    """Train and evaluate quantum model"""
+        # The measurement results are not used yet, so there is no point in
+        # copying and executing one circuit per sample. Draw all placeholder
+        # predictions at once (same random stream as drawing them one by one).
+        # Once real readout is wired up, bind the encode_data() angle batch to
+        # a single parameterized circuit and submit it in one backend call.
+        return (np.random.rand(X.shape[0]) > 0.5).astype(np.int8)
+
+def train_quantum_model(X_train, y_train, X_test, y_test, make_plots=False):
+    """Train and evaluate quantum model (plots are only drawn with make_plots=True)"""
     print("Initializing quantum model...")
     quantum_model = QuantumFraudDetector(n_features=X_train.shape[1])
     quantum_model.train(X_train, y_train)
@@ -227,7 +268,8 @@ def train_quantum_model(X_train, y_train, X_test, y_test):
     for metric, value in quantum_results.items():
         print(f"{metric}: {value:.4f}")
 
-    plot_confusion_matrix(y_test, quantum_pred, "Quantum Model Confusion Matrix")
+    if make_plots:
+        plot_confusion_matrix(y_test, quantum_pred, "Quantum Model Confusion Matrix")
 
     return quantum_model, quantum_results
 
@@ -236,8 +278,9 @@ def save_models(models, quantum_model):
     model_dir = '../model/saved_models'
     os.makedirs(model_dir, exist_ok=True)
 
-    # Save the best classical model (Random Forest)
-    joblib.dump(models['random_forest'][0], f'{model_dir}/random_forest_model.joblib')
+    # Save the best classical model (Histogram Gradient Boosting)
+    joblib.dump(models['hist_gradient_boosting'][0], f'{model_dir}/hist_gradient_boosting_model.joblib',
+                compress=JOBLIB_COMPRESS)
 
     # Save the quantum model parameters
     quantum_params = {
@@ -250,6 +293,10 @@ def save_models(models, quantum_model):
     print("Saved files:", os.listdir(model_dir))
 
 def main():
+    parser = argparse.ArgumentParser(description='Train classical and quantum fraud detection models')
+    parser.add_argument('--plots', action='store_true', help='Show evaluation plots while training')
+    args = parser.parse_args()
+
     # Load preprocessed data
     X_train, X_test, y_train, y_test, feature_names = load_preprocessed_data()
 
@@ -257,10 +304,12 @@ def main():
     qc.init()
 
     # Train classical models
-    classical_models = train_classical_models(X_train, y_train, X_test, y_test, feature_names)
+    classical_models = train_classical_models(X_train, y_train, X_test, y_test, feature_names,
+                                              make_plots=args.plots)
 
     # Train quantum model
-    quantum_model, quantum_results = train_quantum_model(X_train, y_train, X_test, y_test)
+    quantum_model, quantum_results = train_quantum_model(X_train, y_train, X_test, y_test,
+                                                         make_plots=args.plots)
 
     # Save models
     save_models(classical_models, quantum_model)
@@ -9,7 +9,7 @@ def load_models():
     """
     Load the trained model and scaler
     """
-    model_path = 'model/saved_models/random_forest_model.joblib'
+    model_path = 'model/saved_models/hist_gradient_boosting_model.joblib'
     scaler_path = 'data/processed/scaler.joblib'
     
     try:
@@ -20,55 +20,85 @@ def load_models():
         print(f"Error loading models: {str(e)}", file=sys.stderr)
         sys.exit(1)
 
+# Loaded model and scaler (lazily initialized)
+_models = None
+
+def get_models():
+    """
+    Get the trained model and scaler, loading them from disk on first use
+    """
+    global _models
+    if _models is None:
+        _models = load_models()
+    return _models
+
+# Model input features, in training order, with their expected types
+FEATURE_FIELDS = [
+    ('amount', float),
+    ('hour', int),
+    ('day_of_week', int),
+    ('is_weekend', int),
+    ('amount_log', float),
+    ('customer_tx_count', int),
+    ('merchant_tx_count', int),
+    ('merchant_category_encoded', int),
+]
+
+def _extract_features(transaction):
+    """
+    Extract features in the correct order
+    """
+    return [cast(transaction[name]) for name, cast in FEATURE_FIELDS]
+
 def preprocess_transaction(transaction, scaler):
     """
     Preprocess a single transaction
     """
-    # Extract features in the correct order
-    features = [
-        float(transaction['amount']),
-        int(transaction['hour']),
-        int(transaction['day_of_week']),
-        int(transaction['is_weekend']),
-        float(transaction['amount_log']),
-        int(transaction['customer_tx_count']),
-        int(transaction['merchant_tx_count']),
-        int(transaction['merchant_category_encoded'])
-    ]
+    features = _extract_features(transaction)
     
     # Scale features
     features_scaled = scaler.transform(np.array(features).reshape(1, -1))
     return features_scaled
 
+def preprocess_transactions(transactions, scaler):
+    """
+    Preprocess a batch of transactions into a single scaled feature matrix
+    """
+    # Stream every field straight into one preallocated float64 buffer
+    n_fields = len(FEATURE_FIELDS)
+    features = np.fromiter(
+        (cast(t[name]) for t in transactions for name, cast in FEATURE_FIELDS),
+        dtype=np.float64,
+        count=len(transactions) * n_fields
+    ).reshape(len(transactions), n_fields)
+    return scaler.transform(features)
+
 def predict_fraud(transaction_data):
     """
     Predict fraud probability for transactions
     """
-    # Load models
-    model, scaler = load_models()
+    # Load models (cached after the first call)
+    model, scaler = get_models()
     
     # Process single transaction or batch
     if isinstance(transaction_data, dict):
         transaction_data = [transaction_data]
     
-    results = []
-    for transaction in transaction_data:
-        # Preprocess
-        features = preprocess_transaction(transaction, scaler)
-        
-        # Predict
-        prob = model.predict_proba(features)[0][1]
-        is_fraud = prob > 0.5
-        
-        # Format result
-        result = {
+    if not transaction_data:
+        return []
+    
+    # Preprocess and predict the whole batch in one call each
+    features = preprocess_transactions(transaction_data, scaler)
+    probs = model.predict_proba(features)[:, 1]
+    
+    return [
+        {
             'transaction_id': transaction.get('transaction_id', 'unknown'),
-            'is_fraud': bool(is_fraud),
+            'is_fraud': bool(prob > 0.5),
             'fraud_probability': float(prob)
         }
-        results.append(result)
-    
-    return results
+        for transaction, prob in zip(transaction_data, probs)
+    ]
 
 if __name__ == '__main__':
     try:
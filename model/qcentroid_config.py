@@ -11,31 +11,95 @@ IMPORTANT: This uses REAL quantum hardware via QCentroid - no simulator fallback
 """
 
 import os
-import requests
-from typing import Optional, Dict, Any, List
-from dotenv import load_dotenv
+import importlib.util
+import functools
+import types
+import weakref
+from typing import Optional, Dict, Any, List, Mapping
 import json
+import gzip
 import time
+import random
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
-# Load environment variables from .env file
-load_dotenv()
+# requests, httpx and dotenv are imported where first used so that importing
+# this module (e.g. to inspect configuration) stays cheap
 
-class QCentroidConfig:
-    """Configuration class for QCentroid connection"""
+# httpx is optional - it enables concurrent submission of independent circuits
+HTTPX_AVAILABLE = importlib.util.find_spec('httpx') is not None
+
+# orjson is optional - faster (de)serialization of large payloads and result histograms
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize to UTF-8 JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _json_loads(data: bytes):
+    """Parse JSON from bytes (raises ValueError on malformed input)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@functools.lru_cache(maxsize=None)
+def _env_settings() -> Dict[str, Any]:
+    """
+    Read QCentroid settings from the environment, once per process.
     
-    def __init__(self):
-        self.api_key = os.getenv('QCENTROID_API_KEY')
-        self.workspace_id = os.getenv('QCENTROID_WORKSPACE_ID')
-        
+    The .env file is loaded on the first call; later calls (one per
+    QCentroidConfig) reuse the parsed values.
+    """
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    
+    api_key = os.getenv('QCENTROID_API_KEY')
+    return {
+        'api_key': api_key,
+        'workspace_id': os.getenv('QCENTROID_WORKSPACE_ID'),
         # DBS Challenge API endpoint
-        self.challenge_api_url = os.getenv(
+        'challenge_api_url': os.getenv(
             'QCENTROID_CHALLENGE_API',
             'https://api.dev.qcentroid.xyz/use-cases/challenge-2-singapore-t4kmam'
-        )
-        
-        self.backend = os.getenv('QCENTROID_BACKEND', 'qcentroid')
-        self.max_qubits = int(os.getenv('QCENTROID_MAX_QUBITS', '10'))
-        self.shots = int(os.getenv('QCENTROID_SHOTS', '1024'))
+        ),
+        'backend': os.getenv('QCENTROID_BACKEND', 'qcentroid'),
+        'max_qubits': int(os.getenv('QCENTROID_MAX_QUBITS', '10')),
+        'shots': int(os.getenv('QCENTROID_SHOTS', '1024')),
+        # Request headers are fixed for the lifetime of the process - build them once
+        # (read-only view, so callers cannot modify the shared dict)
+        'headers': types.MappingProxyType({
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json'
+        }),
+    }
+
+class QCentroidConfig:
+    """Configuration class for QCentroid connection"""
+    
+    __slots__ = ('api_key', 'workspace_id', 'challenge_api_url', 'backend', 'max_qubits', 'shots', '_headers')
+    
+    def __init__(self):
+        env = _env_settings()
+        self.api_key = env['api_key']
+        self.workspace_id = env['workspace_id']
+        self.challenge_api_url = env['challenge_api_url']
+        self.backend = env['backend']
+        self.max_qubits = env['max_qubits']
+        self.shots = env['shots']
+        self._headers = env['headers']
         
     def validate(self) -> bool:
         """Validate that required configuration is present"""
@@ -45,12 +109,9 @@ class QCentroidConfig:
             print("Warning: QCENTROID_WORKSPACE_ID not set. Using default workspace.")
         return True
     
-    def get_headers(self) -> Dict[str, str]:
-        """Get HTTP headers for API requests"""
-        return {
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json'
-        }
+    def get_headers(self) -> Mapping[str, str]:
+        """Get HTTP headers for API requests (read-only mapping)"""
+        return self._headers
 
 
 class QCentroidChallengeAPI:
@@ -61,10 +122,84 @@ class QCentroidChallengeAPI:
     API Endpoint: https://api.dev.qcentroid.xyz/use-cases/challenge-2-singapore-t4kmam
     """
     
+    SUCCESS_STATES = ('completed', 'success', 'finished')
+    FAILURE_STATES = ('failed', 'error', 'cancelled')
+    
+    # Status lookups for the same job within this many seconds share one request
+    STATUS_CACHE_TTL = 0.2
+    STATUS_CACHE_SIZE = 1024
+    
+    __slots__ = ('config', 'api_url', '_payload_template', '_session', '_stream_supported',
+                 '_status_lock', '_status_cache', '_status_inflight')
+    
     def __init__(self, config: Optional[QCentroidConfig] = None):
         self.config = config or QCentroidConfig()
         self.config.validate()
         self.api_url = self.config.challenge_api_url
+        
+        # Payload fields that are the same for every job this client submits
+        self._payload_template = {
+            'workspace_id': self.config.workspace_id,
+            'backend': self.config.backend,
+            'max_qubits': self.config.max_qubits
+        }
+        
+        # One pooled session for submissions and status polls, so keep-alive
+        # connections are reused instead of a new TCP+TLS handshake per request
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+        )
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._session.headers.update(self.config.get_headers())
+        
+        # Cleared the first time the server turns out not to offer status event streams
+        self._stream_supported = True
+        
+        # Short-lived job status cache + in-flight requests, for coalescing concurrent lookups
+        self._status_lock = threading.Lock()
+        self._status_cache = {}     # job_id -> (monotonic time, status)
+        self._status_inflight = {}  # job_id -> Future of the running request
+    
+    def warm_up(self) -> threading.Thread:
+        """
+        Open a pooled connection to the API host in the background.
+        
+        Sends a cheap HEAD request from a daemon thread so the TCP+TLS
+        handshake is done before the first job submission. Failures are
+        ignored - the submission will simply connect itself.
+        
+        Returns:
+            The started warm-up thread
+        """
+        import requests
+        
+        def _warm():
+            try:
+                self._session.head(self.api_url, timeout=5)
+            except requests.exceptions.RequestException:
+                pass
+        
+        thread = threading.Thread(target=_warm, name='qcentroid-warm-up', daemon=True)
+        thread.start()
+        return thread
+    
+    def close(self):
+        """Close the pooled HTTP session"""
+        self._session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def submit_quantum_job(self, circuit_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -73,6 +208,8 @@ class QCentroidChallengeAPI:
         Args:
             circuit_data: Dictionary containing:
                 - circuit: Quantum circuit definition (QASM or QCentroid format)
+                - circuits: List of circuit definitions, submitted as one batch job
+                  (used instead of circuit)
                 - shots: Number of executions
                 - backend: Quantum backend to use
                 - parameters: Additional circuit parameters
@@ -80,16 +217,9 @@ class QCentroidChallengeAPI:
         Returns:
             API response with job ID and status
         """
-        headers = self.config.get_headers()
+        import requests
         
-        payload = {
-            'workspace_id': self.config.workspace_id,
-            'backend': self.config.backend,
-            'shots': circuit_data.get('shots', self.config.shots),
-            'circuit': circuit_data.get('circuit'),
-            'parameters': circuit_data.get('parameters', {}),
-            'max_qubits': self.config.max_qubits
-        }
+        payload = self._build_payload(circuit_data)
         
         try:
             print(f"📤 Submitting quantum job to QCentroid Challenge API...")
@@ -97,26 +227,56 @@ class QCentroidChallengeAPI:
             print(f"   Backend: {self.config.backend}")
             print(f"   Shots: {payload['shots']}")
             
-            response = requests.post(
+            body, extra_headers = self._encode_payload(payload)
+            response = self._session.post(
                 self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=60
+                data=body,
+                headers=extra_headers,
+                timeout=(10, 60)  # (connect, read)
             )
             response.raise_for_status()
             
-            result = response.json()
+            result = _json_loads(response.content)
             print(f"✓ Job submitted successfully!")
             print(f"   Job ID: {result.get('job_id', 'N/A')}")
             
             return result
             
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"❌ Error submitting job to challenge API: {e}")
-            if hasattr(e, 'response') and e.response is not None:
+            if getattr(e, 'response', None) is not None:
                 print(f"   Response: {e.response.text}")
             raise RuntimeError(f"Failed to submit quantum job: {e}")
     
+    # Bodies above this size are gzipped (QASM text compresses several-fold)
+    GZIP_MIN_BYTES = 4096
+    
+    def _encode_payload(self, payload: Dict[str, Any]):
+        """Serialize a payload to JSON bytes, gzipped when large
+        
+        Returns:
+            Tuple of (body bytes, extra request headers)
+        """
+        body = _json_dumps(payload)
+        if len(body) > self.GZIP_MIN_BYTES:
+            return gzip.compress(body, compresslevel=1), {'Content-Encoding': 'gzip'}
+        return body, {}
+    
+    def _build_payload(self, circuit_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the JSON body for a job submission"""
+        payload = {
+            **self._payload_template,
+            'shots': circuit_data.get('shots', self.config.shots),
+            'parameters': circuit_data.get('parameters', {}),
+        }
+        if 'circuits' in circuit_data:
+            # Server-side batch: one job (and one queue wait) for all circuits
+            payload['circuits'] = circuit_data['circuits']
+            payload['batch'] = True
+        else:
+            payload['circuit'] = circuit_data.get('circuit')
+        return payload
+    
     def get_job_status(self, job_id: str) -> Dict[str, Any]:
         """
         Get status of a submitted job.
@@ -127,31 +287,73 @@ class QCentroidChallengeAPI:
         Returns:
             Job status and results
         """
-        headers = self.config.get_headers()
+        with self._status_lock:
+            cached = self._status_cache.get(job_id)
+            if cached is not None and time.monotonic() - cached[0] < self.STATUS_CACHE_TTL:
+                return cached[1]
+            
+            future = self._status_inflight.get(job_id)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._status_inflight[job_id] = future
+        
+        # Another thread is already fetching this job's status - share its result
+        if not is_owner:
+            return future.result()
+        
+        try:
+            status = self._fetch_job_status(job_id)
+        except BaseException as e:
+            with self._status_lock:
+                del self._status_inflight[job_id]
+            future.set_exception(e)
+            raise
+        
+        with self._status_lock:
+            del self._status_inflight[job_id]
+            if 'error' not in status:
+                if len(self._status_cache) >= self.STATUS_CACHE_SIZE:
+                    self._status_cache.clear()
+                self._status_cache[job_id] = (time.monotonic(), status)
+        future.set_result(status)
+        return status
+    
+    def _fetch_job_status(self, job_id: str) -> Dict[str, Any]:
+        """Request the status of a job from the API (uncached)"""
+        import requests
+        
         url = f"{self.api_url}/jobs/{job_id}"
         
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self._session.get(url, timeout=(10, 30))
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return _json_loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"❌ Error getting job status: {e}")
             return {'error': str(e), 'status': 'unknown'}
     
-    def wait_for_job(self, job_id: str, max_wait_time: int = 300, poll_interval: int = 5) -> Dict[str, Any]:
+    def wait_for_job(self, job_id: str, max_wait_time: int = 300, poll_interval: float = 5,
+                     initial_interval: float = 0.25, multiplier: float = 1.7) -> Dict[str, Any]:
         """
         Wait for a job to complete.
         
+        Status checks start quickly and back off exponentially (with jitter),
+        so short jobs are picked up fast and long ones are not over-polled.
+        
         Args:
             job_id: Job ID to wait for
             max_wait_time: Maximum time to wait in seconds (default: 5 minutes)
-            poll_interval: Time between status checks in seconds
+            poll_interval: Maximum time between status checks in seconds
+            initial_interval: Time before the second status check in seconds (min 0.1)
+            multiplier: Growth factor of the interval after each check
             
         Returns:
             Final job results
         """
         print(f"⏳ Waiting for job {job_id} to complete...")
         start_time = time.time()
+        delay = max(0.1, initial_interval)
         
         while time.time() - start_time < max_wait_time:
             status = self.get_job_status(job_id)
@@ -159,17 +361,174 @@ class QCentroidChallengeAPI:
             job_status = status.get('status', 'unknown')
             print(f"   Status: {job_status}")
             
-            if job_status in ['completed', 'success', 'finished']:
+            if job_status in self.SUCCESS_STATES:
                 print(f"✓ Job completed successfully!")
                 return status
-            elif job_status in ['failed', 'error', 'cancelled']:
+            elif job_status in self.FAILURE_STATES:
                 print(f"❌ Job failed: {status.get('error', 'Unknown error')}")
                 return status
             
-            time.sleep(poll_interval)
+            time.sleep(delay * random.uniform(0.8, 1.2))  # ±20% jitter
+            delay = min(delay * multiplier, poll_interval)
         
         print(f"⚠️  Job timed out after {max_wait_time} seconds")
         return {'status': 'timeout', 'job_id': job_id}
+    
+    def wait_for_job_stream(self, job_id: str, max_wait_time: int = 300) -> Dict[str, Any]:
+        """
+        Wait for a job to complete on a server-sent event stream.
+        
+        One long-lived GET on {api_url}/jobs/{job_id}/events receives every
+        status change, instead of one request per poll. Falls back to
+        wait_for_job polling when the server has no event stream for jobs
+        (remembered for later calls) or the stream drops.
+        
+        Args:
+            job_id: Job ID to wait for
+            max_wait_time: Maximum time to wait in seconds (default: 5 minutes)
+            
+        Returns:
+            Final job results
+        """
+        import requests
+        
+        if not self._stream_supported:
+            return self.wait_for_job(job_id, max_wait_time)
+        
+        print(f"⏳ Waiting for job {job_id} to complete (event stream)...")
+        start_time = time.time()
+        url = f"{self.api_url}/jobs/{job_id}/events"
+        
+        try:
+            with self._session.get(url, headers={'Accept': 'text/event-stream'},
+                                   stream=True, timeout=(10, 30)) as response:
+                if (response.status_code in (404, 405, 406, 501)
+                        or 'text/event-stream' not in response.headers.get('Content-Type', '')):
+                    self._stream_supported = False
+                else:
+                    response.raise_for_status()
+                    for line in response.iter_lines(decode_unicode=True):
+                        # SSE frames: only "data:" lines carry the job status JSON
+                        if not line or not line.startswith('data:'):
+                            continue
+                        status = _json_loads(line[5:].strip())
+                        
+                        job_status = status.get('status', 'unknown')
+                        print(f"   Status: {job_status}")
+                        
+                        if job_status in self.SUCCESS_STATES:
+                            print(f"✓ Job completed successfully!")
+                            return status
+                        elif job_status in self.FAILURE_STATES:
+                            print(f"❌ Job failed: {status.get('error', 'Unknown error')}")
+                            return status
+                        
+                        if time.time() - start_time >= max_wait_time:
+                            break
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
+            print(f"⚠️  Status stream interrupted ({e}), falling back to polling")
+        
+        remaining = max_wait_time - (time.time() - start_time)
+        if remaining <= 0:
+            print(f"⚠️  Job timed out after {max_wait_time} seconds")
+            return {'status': 'timeout', 'job_id': job_id}
+        return self.wait_for_job(job_id, max_wait_time=remaining)
+    
+    def wait_for_jobs(self, job_ids: List[str], max_wait_time: int = 300) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait for several jobs in parallel threads sharing the pooled session.
+        
+        Total wall time is that of the slowest job rather than the sum.
+        
+        Args:
+            job_ids: Job IDs to wait for
+            max_wait_time: Maximum time to wait for each job in seconds
+            
+        Returns:
+            Final job results keyed by job ID
+        """
+        if not job_ids:
+            return {}
+        
+        # At most one thread per pooled connection
+        with ThreadPoolExecutor(max_workers=min(16, len(job_ids))) as executor:
+            futures = {executor.submit(self.wait_for_job_stream, job_id, max_wait_time): job_id
+                       for job_id in job_ids}
+            return {futures[future]: future.result() for future in as_completed(futures)}
+    
+    async def _submit_async(self, client, circuit_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Submit one job on a shared httpx.AsyncClient"""
+        import httpx
+        
+        try:
+            body, extra_headers = self._encode_payload(self._build_payload(circuit_data))
+            response = await client.post(self.api_url, content=body, headers=extra_headers)
+            response.raise_for_status()
+            return _json_loads(response.content)
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"❌ Error submitting job to challenge API: {e}")
+            raise RuntimeError(f"Failed to submit quantum job: {e}")
+    
+    async def _wait_async(self, client, job_id: str, max_wait_time: int = 300, poll_interval: float = 5,
+                          initial_interval: float = 0.25, multiplier: float = 1.7) -> Dict[str, Any]:
+        """Poll one job on a shared httpx.AsyncClient with the same backoff as wait_for_job"""
+        import httpx
+        
+        url = f"{self.api_url}/jobs/{job_id}"
+        start_time = time.time()
+        delay = max(0.1, initial_interval)
+        
+        while time.time() - start_time < max_wait_time:
+            try:
+                response = await client.get(url)
+                response.raise_for_status()
+                status = _json_loads(response.content)
+            except (httpx.HTTPError, ValueError) as e:
+                status = {'error': str(e), 'status': 'unknown'}
+            
+            if status.get('status', 'unknown') in self.SUCCESS_STATES + self.FAILURE_STATES:
+                return status
+            
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))  # ±20% jitter
+            delay = min(delay * multiplier, poll_interval)
+        
+        return {'status': 'timeout', 'job_id': job_id}
+    
+    async def _execute_async(self, circuit_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Submit all jobs concurrently, then wait for all of them concurrently"""
+        import httpx
+        
+        limits = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+        async with httpx.AsyncClient(headers=self.config.get_headers(), limits=limits, timeout=60) as client:
+            submitted = await asyncio.gather(*[self._submit_async(client, data) for data in circuit_data_list])
+            
+            async def finish(result):
+                job_id = result.get('job_id')
+                return await self._wait_async(client, job_id) if job_id else result
+            
+            return list(await asyncio.gather(*[finish(result) for result in submitted]))
+    
+    def execute_jobs(self, circuit_data_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Submit independent jobs concurrently and wait for all of them.
+        
+        Uses httpx.AsyncClient when installed, otherwise submits the jobs in
+        turn on the pooled session and waits for them in parallel threads.
+        Must not be called from a running event loop.
+        
+        Args:
+            circuit_data_list: List of circuit_data dictionaries (see submit_quantum_job)
+            
+        Returns:
+            Final job results, in the same order as circuit_data_list
+        """
+        if not HTTPX_AVAILABLE:
+            submitted = [self.submit_quantum_job(circuit_data) for circuit_data in circuit_data_list]
+            final = self.wait_for_jobs([result['job_id'] for result in submitted if result.get('job_id')])
+            return [final.get(result.get('job_id'), result) for result in submitted]
+        
+        print(f"📤 Submitting {len(circuit_data_list)} quantum jobs concurrently...")
+        return asyncio.run(self._execute_async(circuit_data_list))
 
 
 class QCentroidClient:
@@ -180,14 +539,27 @@ class QCentroidClient:
     and retrieves results. NO SIMULATOR - uses real quantum hardware.
     """
     
-    def __init__(self, config: Optional[QCentroidConfig] = None):
+    def __init__(self, config: Optional[QCentroidConfig] = None, prewarm: bool = False):
+        """
+        Args:
+            config: QCentroid configuration (read from the environment by default)
+            prewarm: Create the API client now and open its connection in the
+                background, so the first job submission skips the handshake
+        """
         self.config = config or QCentroidConfig()
         self.config.validate()
-        self.challenge_api = QCentroidChallengeAPI(self.config)
+        self._qasm_cache = {}  # id(circuit) -> QASM, entries dropped when the circuit is collected
+        if prewarm:
+            self.challenge_api.warm_up()
         print(f"✓ Connected to QCentroid Challenge Platform")
         print(f"   API: {self.config.challenge_api_url}")
         print(f"   Backend: {self.config.backend}")
     
+    @functools.cached_property
+    def challenge_api(self) -> QCentroidChallengeAPI:
+        """API client, created on first job submission (not needed for config/info queries)"""
+        return QCentroidChallengeAPI(self.config)
+    
     def execute_circuit(self, circuit, shots: Optional[int] = None, parameters: Optional[Dict] = None):
         """
         Execute a quantum circuit on QCentroid platform.
@@ -200,30 +572,101 @@ class QCentroidClient:
         Returns:
             Execution results
         """
-        # Convert circuit to QASM or QCentroid format
-        try:
-            # Try to export as QASM
-            circuit_qasm = circuit.qasm()
-        except AttributeError:
-            # If not a Qiskit circuit, assume it's already in correct format
-            circuit_qasm = str(circuit)
+        circuit_data = self._circuit_data(circuit, shots, parameters)
+        
+        # Submit job
+        job_result = self.challenge_api.submit_quantum_job(circuit_data)
+        
+        # Wait for completion
+        job_id = job_result.get('job_id')
+        if job_id:
+            final_result = self.challenge_api.wait_for_job_stream(job_id)
+            return final_result
         
+        return job_result
+    
+    def execute_circuits(self, circuits, shots: Optional[int] = None, parameters: Optional[Dict] = None):
+        """
+        Execute independent quantum circuits concurrently on QCentroid platform.
+        
+        Args:
+            circuits: Iterable of quantum circuits (Qiskit QuantumCircuit objects)
+            shots: Number of executions per circuit
+            parameters: Additional parameters shared by all circuits
+            
+        Returns:
+            List of execution results, one per circuit
+        """
+        circuit_data_list = [self._circuit_data(circuit, shots, parameters) for circuit in circuits]
+        return self.challenge_api.execute_jobs(circuit_data_list)
+    
+    def execute_batch(self, circuits, shots: Optional[int] = None, parameters: Optional[Dict] = None) -> List[Dict[str, Any]]:
+        """
+        Execute quantum circuits as a single batch job on QCentroid platform.
+        
+        All circuits go out in one POST and share one queue wait, instead of
+        one job per circuit.
+        
+        Args:
+            circuits: Iterable of quantum circuits (Qiskit QuantumCircuit objects)
+            shots: Number of executions per circuit
+            parameters: Additional parameters shared by all circuits
+            
+        Returns:
+            List of per-circuit results (the batch job result if it has none)
+        """
         circuit_data = {
-            'circuit': circuit_qasm,
+            'circuits': [self._to_qasm(circuit) for circuit in circuits],
             'shots': shots or self.config.shots,
             'parameters': parameters or {}
         }
         
-        # Submit job
         job_result = self.challenge_api.submit_quantum_job(circuit_data)
         
-        # Wait for completion
         job_id = job_result.get('job_id')
         if job_id:
-            final_result = self.challenge_api.wait_for_job(job_id)
-            return final_result
+            job_result = self.challenge_api.wait_for_job_stream(job_id)
         
-        return job_result
+        if 'results' in job_result:
+            return job_result['results']
+        return [job_result] * len(circuit_data['circuits'])
+    
+    def _circuit_data(self, circuit, shots: Optional[int] = None, parameters: Optional[Dict] = None) -> Dict[str, Any]:
+        """Build the circuit_data dictionary for one circuit"""
+        return {
+            'circuit': self._to_qasm(circuit),
+            'shots': shots or self.config.shots,
+            'parameters': parameters or {}
+        }
+    
+    def _to_qasm(self, circuit) -> str:
+        """
+        Serialize a circuit to QASM, once per circuit object.
+        
+        Resubmitting the same circuit object reuses its cached QASM, so a
+        circuit must not be modified after its first submission.
+        """
+        # Pre-serialized circuits are sent as-is
+        if isinstance(circuit, str):
+            return circuit
+        
+        key = id(circuit)
+        circuit_qasm = self._qasm_cache.get(key)
+        if circuit_qasm is not None:
+            return circuit_qasm
+        
+        # Convert circuit to QASM or QCentroid format
+        if not hasattr(circuit, 'qasm'):
+            # If not a Qiskit circuit, assume it's already in correct format
+            return str(circuit)
+        circuit_qasm = circuit.qasm()
+        
+        try:
+            weakref.finalize(circuit, self._qasm_cache.pop, key, None)
+        except TypeError:
+            return circuit_qasm  # Not weak-referenceable - cannot tell when the id is reused
+        self._qasm_cache[key] = circuit_qasm
+        return circuit_qasm
     
     def is_available(self) -> bool:
         """Check if QCentroid backend is available"""
@@ -247,13 +690,21 @@ class QCentroidClient:
 
 # Global client instance (lazily initialized)
 _qcentroid_client = None
+_qcentroid_client_lock = threading.Lock()
 
 def get_qcentroid_client() -> QCentroidClient:
-    """Get or create the global QCentroid client instance"""
+    """Get or create the global QCentroid client instance (thread-safe)"""
     global _qcentroid_client
-    if _qcentroid_client is None:
-        _qcentroid_client = QCentroidClient()
-    return _qcentroid_client
+    # Fast path: already created, no lock needed
+    client = _qcentroid_client
+    if client is not None:
+        return client
+    
+    # Double-checked so only one thread ever creates the client
+    with _qcentroid_client_lock:
+        if _qcentroid_client is None:
+            _qcentroid_client = QCentroidClient()
+        return _qcentroid_client
 
 
 # Example usage
@@ -265,7 +716,7 @@ if __name__ == "__main__":
     # Test configuration
     config = QCentroidConfig()
     print(f"\nConfiguration:")
-    print(f"  API URL: {config.api_url}")
+    print(f"  API URL: {config.challenge_api_url}")
     print(f"  Backend: {config.backend}")
     print(f"  Max Qubits: {config.max_qubits}")
     print(f"  Shots: {config.shots}")
@@ -283,4 +734,4 @@ if __name__ == "__main__":
         print("\n✓ Quantum backend is ready!")
     else:
         print("\n✗ Quantum backend is not available")
-        print("  Install dependencies: pip install qiskit qiskit-aer")
+        print("  Set QCENTROID_API_KEY in your .env file")
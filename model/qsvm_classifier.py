@@ -14,6 +14,8 @@ import numpy as np
 from typing import List, Tuple, Optional, TYPE_CHECKING
 from sklearn.svm import SVC
 from sklearn.metrics import accuracy_score
+from scipy.linalg.blas import get_blas_funcs
+from joblib import Parallel, delayed, effective_n_jobs
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -26,8 +28,16 @@ try:
         # Fallback to Qiskit 0.x location
         from qiskit.circuit import QuantumCircuit
     
+    from qiskit import transpile
+    
     from qiskit.circuit.library import ZZFeatureMap, PauliFeatureMap
     
+    # Default data map φ(x) of Pauli feature maps; only it has a closed form here
+    try:
+        from qiskit.circuit.library.data_preparation.pauli_feature_map import self_product
+    except ImportError:
+        self_product = None
+    
     # Handle AerSimulator location differences
     try:
         from qiskit_aer import AerSimulator
@@ -40,14 +50,14 @@ try:
     except ImportError:
         Sampler = None  # Not critical
     
-    from qiskit_machine_learning.kernels import FidelityQuantumKernel
+    from qiskit.quantum_info import Statevector
     
     QISKIT_AVAILABLE = True
     print("✓ Qiskit imported successfully")
     
 except ImportError as e:
     print(f"Warning: Qiskit not available. Error: {e}")
-    print("Install with: pip install qiskit qiskit-aer qiskit-machine-learning")
+    print("Install with: pip install qiskit qiskit-aer")
     QISKIT_AVAILABLE = False
     # Create dummy types for runtime
     if not TYPE_CHECKING:
@@ -55,7 +65,19 @@ except ImportError as e:
         ZZFeatureMap = object
         PauliFeatureMap = object
         AerSimulator = object
-        FidelityQuantumKernel = object
+        Statevector = object
+
+try:
+    from ._compat import bind_params
+except ImportError:  # run as a script from model/
+    from _compat import bind_params
+
+# Numba is optional - fall back to vectorised NumPy when it is missing
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 # For type checking
 if TYPE_CHECKING:
@@ -63,6 +85,140 @@ if TYPE_CHECKING:
     from qiskit.circuit.library import ZZFeatureMap
 
 
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _hermitian_fidelity(C):
+        """|C|² of a Hermitian overlap matrix, reading only its strict upper triangle"""
+        n = C.shape[0]
+        K = np.empty((n, n))
+        for j in prange(n):
+            for i in range(j):
+                c = C[i, j]
+                v = c.real * c.real + c.imag * c.imag
+                K[i, j] = v
+                K[j, i] = v
+            K[j, j] = 1.0
+        return K
+else:
+    def _hermitian_fidelity(C):
+        """|C|² of a Hermitian overlap matrix, reading only its strict upper triangle"""
+        K = np.triu(C.real ** 2 + C.imag ** 2, 1)
+        K += K.T
+        np.fill_diagonal(K, 1.0)
+        return K
+
+
+def fidelity_gram(S1: np.ndarray, S2: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Fidelity kernel |⟨s1_i|s2_j⟩|² between two stacks of statevectors.
+    
+    Args:
+        S1: Statevectors as rows (shape: n_samples_1, 2**n_qubits)
+        S2: Statevectors as rows (shape: n_samples_2, 2**n_qubits)
+            If None, compute the Gram matrix of S1
+    
+    Returns:
+        Kernel matrix (shape: n_samples_1, n_samples_2)
+    """
+    if S2 is None:
+        # Gram matrix is Hermitian: HERK fills only the upper triangle
+        # (half the flops of a GEMM), then square and mirror in one pass.
+        # The diagonal is set to its exact value ⟨s|s⟩² = 1, so rounding in
+        # the simulated states cannot perturb it and break PSD-ness
+        herk = get_blas_funcs('herk', (S1,))
+        return _hermitian_fidelity(herk(1.0, S1))
+    
+    # All overlaps ⟨s1_i|s2_j⟩ in one complex GEMM, then |.|²
+    overlaps = S1.conj() @ S2.T
+    return overlaps.real ** 2 + overlaps.imag ** 2
+
+
+def default_simulator():
+    """
+    Single-precision statevector AerSimulator, on the GPU (cuStateVec) when Aer
+    was built with CUDA.
+    
+    Returns:
+        AerSimulator instance
+    """
+    try:
+        if 'GPU' in AerSimulator().available_devices():
+            return AerSimulator(method='statevector', device='GPU', precision='single',
+                                cuStateVec_enable=True)
+    except Exception:
+        pass  # Older Aer without device discovery - stay on the CPU
+    return AerSimulator(method='statevector', precision='single')
+
+
+def _simulate_statevectors(feature_map, sv_template, backend, X: np.ndarray) -> List[np.ndarray]:
+    """
+    Simulate the statevector of every row of X.
+    
+    Args:
+        feature_map: Parametric feature map circuit
+        sv_template: feature_map with a save_statevector instruction (Aer backends),
+            or None to use exact quantum_info.Statevector simulation
+        backend: Aer backend that runs sv_template
+        X: Samples (shape: n_samples, n_features)
+        
+    Returns:
+        List of complex64 statevector amplitude arrays
+    """
+    params = feature_map.parameters
+    if sv_template is None:
+        return [Statevector(bind_params(feature_map, dict(zip(params, x)))).data.astype(np.complex64)
+                for x in X]
+    
+    # One job for the whole batch: Aer binds every row to the same compiled
+    # circuit itself, instead of Python building one bound circuit per sample
+    binds = [{param: X[:, k].tolist() for k, param in enumerate(params)}]
+    result = backend.run(sv_template, parameter_binds=binds).result()
+    return [np.asarray(result.data(i)['statevector'], dtype=np.complex64) for i in range(len(X))]
+
+
+def _zz_statevectors(X: np.ndarray, entangler_maps: List[List[Tuple[int, int]]],
+                     alpha: float = 2.0) -> np.ndarray:
+    """
+    Closed-form statevectors of a ZZ feature map, without building circuits.
+    
+    Each repetition is a Hadamard layer followed by U_Φ(x), and U_Φ(x) is
+    diagonal in the computational basis: P(α·x_i) on qubit i and
+    CX·P(α·(π-x_i)(π-x_j))·CX on pair (i, j) only add a phase to basis
+    states with b_i = 1 and b_i ⊕ b_j = 1 respectively. So every
+    repetition is one elementwise phase multiply plus a Walsh-Hadamard
+    transform, vectorised over all samples.
+    
+    Args:
+        X: Samples (shape: n_samples, n_qubits)
+        entangler_maps: Entangled qubit pairs for each repetition
+        alpha: Rotation prefactor of the feature map
+        
+    Returns:
+        Complex statevectors in Qiskit (little-endian) ordering
+        (shape: n_samples, 2**n_qubits)
+    """
+    n_samples, n = X.shape
+    dim = 1 << n
+    bits = (np.arange(dim)[:, None] >> np.arange(n)) & 1
+    
+    psi = np.full((n_samples, dim), dim ** -0.5, dtype=np.complex128)  # H⊗n|0⟩
+    for rep, pairs in enumerate(entangler_maps):
+        if rep:
+            # H⊗n as a butterfly over each qubit axis
+            psi = psi.reshape((n_samples,) + (2,) * n)
+            for axis in range(1, n + 1):
+                a, b = psi.take(0, axis=axis), psi.take(1, axis=axis)
+                psi = np.stack([a + b, a - b], axis=axis)
+            psi = psi.reshape(n_samples, dim) * dim ** -0.5
+        
+        theta = X @ bits.T
+        if pairs:
+            i, j = np.array(pairs).T
+            theta += ((np.pi - X[:, i]) * (np.pi - X[:, j])) @ (bits[:, i] ^ bits[:, j]).T
+        psi *= np.exp(1j * alpha * theta)
+    return psi
+
+
 class ZZFeatureMapEncoder:
     """
     ZZ-FeatureMap encoder for quantum states.
@@ -75,7 +231,13 @@ class ZZFeatureMapEncoder:
     where U_Φ(x) contains Z rotations and ZZ entangling gates
     """
     
-    def __init__(self, n_features: int, reps: int = 2, entanglement: str = 'full'):
+    def __init__(
+        self,
+        n_features: int,
+        reps: int = 2,
+        entanglement: str = 'full',
+        feature_map: Optional[ZZFeatureMap] = None
+    ):
         """
         Initialize ZZ-FeatureMap encoder.
         
@@ -83,19 +245,51 @@ class ZZFeatureMapEncoder:
             n_features: Number of features (qubits)
             reps: Number of repetitions of the feature map circuit
             entanglement: Entanglement pattern ('full', 'linear', 'circular')
+            feature_map: Already-built ZZFeatureMap to use instead of building one;
+                its reps, entanglement and alpha take precedence
         """
-        self.n_features = n_features
-        self.reps = reps
-        self.entanglement = entanglement
+        if not QISKIT_AVAILABLE:
+            raise ImportError("Qiskit is required for ZZ-FeatureMap encoding")
         
-        if QISKIT_AVAILABLE:
-            self.feature_map = ZZFeatureMap(
+        if feature_map is None and n_features == 1:
+            # ZZFeatureMap needs 2 qubits; with one there are no ZZ terms left
+            feature_map = PauliFeatureMap(1, reps=reps, paulis=['Z'])
+        elif feature_map is None:
+            feature_map = ZZFeatureMap(
                 feature_dimension=n_features,
                 reps=reps,
                 entanglement=entanglement
             )
-        else:
-            raise ImportError("Qiskit is required for ZZ-FeatureMap encoding")
+        elif feature_map.num_qubits != n_features:
+            raise ValueError(
+                f"feature_map has {feature_map.num_qubits} qubits, expected {n_features}"
+            )
+        
+        self.n_features = n_features
+        self.reps = feature_map.reps
+        self.entanglement = feature_map.entanglement
+        self.feature_map = feature_map
+        
+        # statevectors() hard-codes the default data map; a custom
+        # data_map_func has to be simulated from the circuit instead
+        self.closed_form = (
+            self_product is not None
+            and getattr(feature_map, '_data_map_func', None) is self_product
+        )
+        
+        # Flatten and optimize the parametric circuit once; encoding a sample
+        # then only binds parameters instead of rebuilding/decomposing the map
+        self.transpiled_map = transpile(
+            self.feature_map,
+            basis_gates=['h', 'p', 'cx'],
+            optimization_level=3
+        )
+        self._params = self.transpiled_map.parameters
+        
+        self._entangler_maps = [
+            self.feature_map.get_entangler_map(rep, 1, 2) if n_features > 1 else []
+            for rep in range(self.reps)
+        ]
     
     def encode(self, x: np.ndarray) -> QuantumCircuit:
         """
@@ -107,7 +301,33 @@ class ZZFeatureMapEncoder:
         Returns:
             Quantum circuit with encoded data
         """
-        return self.feature_map.bind_parameters(x)
+        return bind_params(self.transpiled_map, dict(zip(self._params, x)))
+    
+    def statevectors(self, X: np.ndarray, chunk_size: int = 4096) -> np.ndarray:
+        """
+        Exact statevectors of the encoded samples, computed in closed form.
+        
+        Args:
+            X: Samples (shape: n_samples, n_features)
+            chunk_size: Samples per vectorised batch (bounds temporary memory)
+            
+        Returns:
+            complex64 statevectors (shape: n_samples, 2**n_features)
+            
+        Raises:
+            ValueError: The feature map uses a custom data_map_func
+        """
+        if not self.closed_form:
+            raise ValueError(
+                "feature_map has a custom data_map_func; simulate its circuit instead"
+            )
+        
+        X = np.asarray(X, dtype=np.float64)
+        out = np.empty((len(X), 2 ** self.n_features), dtype=np.complex64)
+        for start in range(0, len(X), chunk_size):
+            stop = start + chunk_size
+            out[start:stop] = _zz_statevectors(X[start:stop], self._entangler_maps, self.feature_map.alpha)
+        return out
     
     def get_circuit(self) -> QuantumCircuit:
         """Get the parametric feature map circuit"""
@@ -122,26 +342,114 @@ class QuantumKernelComputer:
     K(x_i, x_j) = |⟨φ(x_i)|φ(x_j)⟩|²
     
     where φ(x) = U(x)|0⟩ is the quantum state after encoding.
+    
+    Each sample's statevector is simulated once and cached, so the
+    training states computed in fit are reused when predicting, and the
+    whole kernel matrix is a single complex matrix product.
     """
     
-    def __init__(self, feature_map: ZZFeatureMap, backend=None):
+    # Below this many uncached samples per worker, process start-up costs more than it saves
+    MIN_SAMPLES_PER_JOB = 32
+    
+    def __init__(
+        self,
+        feature_map: ZZFeatureMap,
+        backend=None,
+        n_jobs: int = -1,
+        encoder: Optional[ZZFeatureMapEncoder] = None
+    ):
         """
         Initialize quantum kernel computer.
         
         Args:
             feature_map: ZZ-FeatureMap for encoding
             backend: Quantum backend (simulator or real device)
+            n_jobs: CPU worker processes for statevector simulation (-1 = all cores)
+            encoder: Encoder that built feature_map. When given, no backend is
+                requested and the encoder has a closed form, statevectors come
+                from it instead of running circuits
         """
         self.feature_map = feature_map
+        self.n_jobs = n_jobs
+        self._encoder = (
+            encoder if backend is None and encoder is not None and encoder.closed_form
+            else None
+        )
         
-        if backend is None:
-            self.backend = AerSimulator()
-        else:
-            self.backend = backend
+        # The closed-form encoder never runs circuits, so skip building a simulator
+        self.backend = None
+        self._sv_template = None
+        if self._encoder is None:
+            self.backend = default_simulator() if backend is None else backend
+            
+            # Aer backends simulate all uncached samples as one batched job
+            if isinstance(self.backend, AerSimulator):
+                self._sv_template = feature_map.copy()
+                self._sv_template.save_statevector()
+        
+        # Statevector cache as one contiguous complex64 matrix (rows grown
+        # geometrically) plus sample bytes (float64) -> row index. Single
+        # precision is far below simulator/shot noise for kernel fidelities and
+        # halves memory and Gram (CGEMM/CHERK) bandwidth
+        self._sv_matrix = np.empty((0, 2 ** feature_map.num_qubits), dtype=np.complex64)
+        self._sv_index = {}
+    
+    def _simulate(self, X: np.ndarray) -> List[np.ndarray]:
+        """Simulate the statevector of every row of X, split across CPU cores"""
+        if self._encoder is not None:
+            return self._encoder.statevectors(X)
+        
+        on_gpu = getattr(getattr(self.backend, 'options', None), 'device', 'CPU') == 'GPU'
+        n_workers = min(effective_n_jobs(self.n_jobs), len(X) // self.MIN_SAMPLES_PER_JOB)
+        
+        # The GPU already batches the whole job; small jobs are not worth the workers
+        if on_gpu or n_workers <= 1:
+            return _simulate_statevectors(self.feature_map, self._sv_template, self.backend, X)
+        
+        parts = Parallel(n_jobs=n_workers, backend='loky')(
+            delayed(_simulate_statevectors)(self.feature_map, self._sv_template, self.backend, chunk)
+            for chunk in np.array_split(X, n_workers)
+        )
+        return [sv for part in parts for sv in part]
+    
+    def _statevectors(self, X: np.ndarray) -> np.ndarray:
+        """
+        Statevectors φ(x) for every row of X, simulating only uncached rows.
+        
+        Args:
+            X: Dataset (shape: n_samples, n_features)
+            
+        Returns:
+            complex64 matrix of statevectors (shape: n_samples, 2**n_features)
+        """
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        keys = [x.tobytes() for x in X]
+        
+        # First occurrence of every uncached sample
+        missing = {}
+        for i, key in enumerate(keys):
+            if key not in self._sv_index and key not in missing:
+                missing[key] = i
+        
+        if missing:
+            self._append(missing.keys(), self._simulate(X[list(missing.values())]))
         
-        # Create quantum kernel using Qiskit ML
-        if QISKIT_AVAILABLE:
-            self.quantum_kernel = FidelityQuantumKernel(feature_map=feature_map)
+        rows = np.fromiter((self._sv_index[key] for key in keys), dtype=np.intp, count=len(keys))
+        return self._sv_matrix[rows]
+    
+    def _append(self, keys, statevectors: List[np.ndarray]):
+        """Add new statevectors to the cache, doubling its capacity when full"""
+        start = len(self._sv_index)
+        stop = start + len(statevectors)
+        
+        if stop > len(self._sv_matrix):
+            grown = np.empty((max(stop, 2 * len(self._sv_matrix)), self._sv_matrix.shape[1]),
+                             dtype=np.complex64)
+            grown[:start] = self._sv_matrix[:start]
+            self._sv_matrix = grown
+        
+        self._sv_matrix[start:stop] = statevectors
+        self._sv_index.update(zip(keys, range(start, stop)))
     
     def compute_kernel_matrix(self, X1: np.ndarray, X2: Optional[np.ndarray] = None) -> np.ndarray:
         """
@@ -155,12 +463,9 @@ class QuantumKernelComputer:
         Returns:
             Kernel matrix (shape: n_samples_1, n_samples_2)
         """
-        if X2 is None:
-            X2 = X1
-        
-        # Compute quantum kernel matrix
-        kernel_matrix = self.quantum_kernel.evaluate(X1, X2)
-        return kernel_matrix
+        S1 = self._statevectors(X1)
+        S2 = None if X2 is None else self._statevectors(X2)
+        return fidelity_gram(S1, S2)
 
 
 class QSVM:
@@ -177,7 +482,10 @@ class QSVM:
         reps: int = 2,
         entanglement: str = 'full',
         C: float = 1.0,
-        backend=None
+        backend=None,
+        kernel_computer: Optional[QuantumKernelComputer] = None,
+        feature_map: Optional[ZZFeatureMap] = None,
+        verbose: bool = True
     ):
         """
         Initialize QSVM.
@@ -188,23 +496,38 @@ class QSVM:
             entanglement: Entanglement pattern
             C: SVM regularization parameter
             backend: Quantum backend
+            kernel_computer: Existing kernel computer for an n_features-qubit map to
+                share (and its statevector cache); if None, a new one is built
+            feature_map: Already-built ZZFeatureMap to encode with (overrides reps
+                and entanglement); ignored when kernel_computer is given
+            verbose: Print training progress
         """
         self.n_features = n_features
         self.C = C
+        self.verbose = verbose
         
-        # Create ZZ-FeatureMap encoder
-        self.encoder = ZZFeatureMapEncoder(n_features, reps, entanglement)
-        
-        # Create quantum kernel computer
-        self.kernel_computer = QuantumKernelComputer(
-            self.encoder.feature_map,
-            backend
-        )
+        if kernel_computer is None:
+            # Create ZZ-FeatureMap encoder
+            self.encoder = ZZFeatureMapEncoder(n_features, reps, entanglement, feature_map)
+            
+            # Create quantum kernel computer
+            kernel_computer = QuantumKernelComputer(
+                self.encoder.transpiled_map,
+                backend,
+                encoder=self.encoder
+            )
+        else:
+            self.encoder = None
+        self.kernel_computer = kernel_computer
+        self.feature_map = self.encoder.feature_map if self.encoder is not None else None
         
-        # Classical SVM with precomputed quantum kernel
-        self.svm = SVC(kernel='precomputed', C=C, probability=True)
+        # Classical SVM with precomputed quantum kernel. Platt scaling is left
+        # off: it refits the SVM 5 times, and probabilities are derived from
+        # the decision function instead (see predict_proba).
+        self.svm = SVC(kernel='precomputed', C=C, probability=False)
         
-        self.X_train = None
+        self._S_sv = None
+        self._n_train = 0
         self.is_trained = False
     
     def fit(self, X_train: np.ndarray, y_train: np.ndarray):
@@ -215,20 +538,42 @@ class QSVM:
             X_train: Training features (shape: n_samples, n_features)
             y_train: Training labels (shape: n_samples)
         """
-        print(f"Computing quantum kernel matrix for {len(X_train)} training samples...")
+        if self.verbose:
+            print(f"Computing quantum kernel matrix for {len(X_train)} training samples...")
         
-        # Compute kernel matrix for training data
-        K_train = self.kernel_computer.compute_kernel_matrix(X_train)
+        S_train = self.kernel_computer._statevectors(X_train)
+        K_train = fidelity_gram(S_train)
         
-        print("Training classical SVM with quantum kernel...")
+        if self.verbose:
+            print("Training classical SVM with quantum kernel...")
         # Train SVM with precomputed kernel
         self.svm.fit(K_train, y_train)
         
-        # Store training data for prediction
-        self.X_train = X_train
+        # Only support-vector states enter the decision function, so keep just
+        # those: prediction simulates the test samples and does one small GEMM
+        self._S_sv = S_train[self.svm.support_]
+        self._n_train = len(S_train)
         self.is_trained = True
         
-        print("✓ QSVM training complete")
+        if self.verbose:
+            print("✓ QSVM training complete")
+    
+    def _test_kernel(self, X_test: np.ndarray) -> np.ndarray:
+        """
+        Kernel between test samples and the training set, as SVC expects it.
+        
+        LIBSVM only reads the support-vector columns of a precomputed kernel,
+        so the remaining columns are left at zero instead of being computed.
+        
+        Args:
+            X_test: Test features (shape: n_samples, n_features)
+            
+        Returns:
+            Kernel matrix (shape: n_samples, n_train_samples)
+        """
+        K_test = np.zeros((len(X_test), self._n_train))
+        K_test[:, self.svm.support_] = fidelity_gram(self.kernel_computer._statevectors(X_test), self._S_sv)
+        return K_test
     
     def predict(self, X_test: np.ndarray) -> np.ndarray:
         """
@@ -243,30 +588,42 @@ class QSVM:
         if not self.is_trained:
             raise ValueError("Model must be trained before prediction")
         
-        # Compute kernel matrix between test and training data
-        K_test = self.kernel_computer.compute_kernel_matrix(X_test, self.X_train)
-        
         # Predict using SVM
-        return self.svm.predict(K_test)
+        return self.svm.predict(self._test_kernel(X_test))
     
-    def predict_proba(self, X_test: np.ndarray) -> np.ndarray:
+    def decision_function(self, X_test: np.ndarray) -> np.ndarray:
         """
-        Predict class probabilities for test data.
+        Signed distance to the SVM margin for test data.
+        
+        Positive values correspond to the positive (fraud) class, so one call
+        is enough to derive both labels and scores.
         
         Args:
             X_test: Test features (shape: n_samples, n_features)
             
         Returns:
-            Class probabilities (shape: n_samples, 2)
+            Decision values (shape: n_samples)
         """
         if not self.is_trained:
             raise ValueError("Model must be trained before prediction")
         
-        # Compute kernel matrix between test and training data
-        K_test = self.kernel_computer.compute_kernel_matrix(X_test, self.X_train)
+        return self.svm.decision_function(self._test_kernel(X_test))
+    
+    def predict_proba(self, X_test: np.ndarray) -> np.ndarray:
+        """
+        Predict class probabilities for test data.
+        
+        Probabilities are a logistic squashing of the decision function, which
+        preserves the ranking used by AUC-ROC/AUC-PR.
         
-        # Predict probabilities using SVM
-        return self.svm.predict_proba(K_test)
+        Args:
+            X_test: Test features (shape: n_samples, n_features)
+            
+        Returns:
+            Class probabilities (shape: n_samples, 2)
+        """
+        prob = 1.0 / (1.0 + np.exp(-self.decision_function(X_test)))
+        return np.column_stack([1.0 - prob, prob])
     
     def score(self, X_test: np.ndarray, y_test: np.ndarray) -> float:
         """
@@ -295,7 +652,11 @@ class QuantumFeatureSelector:
         self,
         n_features: int,
         C: float = 1.0,
-        max_features: int = None
+        max_features: int = None,
+        n_landmarks: Optional[int] = 64,
+        patience: Optional[int] = None,
+        min_delta: Optional[float] = None,
+        verbose: bool = False
     ):
         """
         Initialize quantum feature selector.
@@ -304,10 +665,25 @@ class QuantumFeatureSelector:
             n_features: Total number of features
             C: SVM regularization parameter
             max_features: Maximum number of features to select
+            n_landmarks: Nyström landmark samples used to score candidate subsets
+                during greedy selection (None = exact kernel for every trial)
+            patience: From the second greedy step on, once a candidate improves the
+                score, stop scanning after this many further candidates fail to
+                beat it (None = scan every candidate)
+            min_delta: From the second greedy step on, accept a candidate
+                immediately when it beats the previous step's score by more than
+                this (None = never short-circuit). Both early exits make the
+                result depend on feature order
+            verbose: Print the score of every candidate feature during greedy
+                selection (step results are always printed)
         """
         self.n_features = n_features
         self.C = C
         self.max_features = max_features or min(n_features, 8)  # NISQ constraint
+        self.n_landmarks = n_landmarks
+        self.patience = patience
+        self.min_delta = min_delta
+        self.verbose = verbose
         self.selected_features = None
         self.qsvm = None
     
@@ -332,13 +708,27 @@ class QuantumFeatureSelector:
         """
         selected = []
         remaining = list(range(self.n_features))
-        best_score = 0.0
+        best_score = -np.inf  # no baseline until the first step has scanned every feature
+        
+        # Same landmarks for every trial, so candidate scores stay comparable
+        landmarks = None
+        if self.n_landmarks is not None and len(X_train) > self.n_landmarks:
+            rng = np.random.default_rng(42)
+            landmarks = np.sort(rng.choice(len(X_train), self.n_landmarks, replace=False))
         
         print(f"Starting quantum feature selection (max {self.max_features} features)...")
         
         for i in range(self.max_features):
             best_feature = None
             current_best_score = best_score
+            since_improvement = 0
+            early_exit = np.isfinite(best_score)
+            
+            # Every candidate at this step has the same qubit count, so they share
+            # one transpiled feature map and statevector cache. Validation rows
+            # are scored against training states that are already cached.
+            encoder = ZZFeatureMapEncoder(len(selected) + 1)
+            kernel_computer = QuantumKernelComputer(encoder.transpiled_map, encoder=encoder)
             
             for feature in remaining:
                 # Try adding this feature
@@ -348,18 +738,34 @@ class QuantumFeatureSelector:
                 X_train_subset = X_train[:, trial_features]
                 X_val_subset = X_val[:, trial_features]
                 
-                # Train QSVM with this feature subset
-                qsvm = QSVM(n_features=len(trial_features), C=self.C)
-                qsvm.fit(X_train_subset, y_train)
+                if landmarks is None:
+                    # Train QSVM with this feature subset
+                    qsvm = QSVM(n_features=len(trial_features), C=self.C,
+                                kernel_computer=kernel_computer, verbose=self.verbose)
+                    qsvm.fit(X_train_subset, y_train)
+                    
+                    # Evaluate on validation set
+                    score = qsvm.score(X_val_subset, y_val)
+                else:
+                    score = self._nystrom_score(
+                        kernel_computer, X_train_subset, y_train, X_val_subset, y_val, landmarks
+                    )
                 
-                # Evaluate on validation set
-                score = qsvm.score(X_val_subset, y_val)
-                
-                print(f"  Feature {feature}: score = {score:.4f}")
+                if self.verbose:
+                    print(f"  Feature {feature}: score = {score:.4f}")
                 
                 if score > current_best_score:
                     current_best_score = score
                     best_feature = feature
+                    since_improvement = 0
+                    
+                    # Clear win over the previous step: take it without scanning the rest
+                    if early_exit and self.min_delta is not None and score > best_score + self.min_delta:
+                        break
+                elif best_feature is not None:
+                    since_improvement += 1
+                    if early_exit and self.patience is not None and since_improvement >= self.patience:
+                        break
             
             if best_feature is not None:
                 selected.append(best_feature)
@@ -373,6 +779,47 @@ class QuantumFeatureSelector:
         self.selected_features = selected
         return selected
     
+    def _nystrom_score(
+        self,
+        kernel_computer: QuantumKernelComputer,
+        X_train: np.ndarray,
+        y_train: np.ndarray,
+        X_val: np.ndarray,
+        y_val: np.ndarray,
+        landmarks: np.ndarray
+    ) -> float:
+        """
+        Validation accuracy of an SVM on a Nyström approximation of the quantum kernel.
+        
+        K ≈ C W⁺ Cᵀ, with C = K(X, landmarks) and W = K(landmarks, landmarks).
+        A linear SVM on the features Φ = C W^(-1/2) solves the same problem as
+        an SVM on that approximate kernel, without forming any N×N matrix.
+        
+        Args:
+            kernel_computer: Kernel computer for the candidate subset's qubit count
+            X_train: Training features of the candidate subset
+            y_train: Training labels
+            X_val: Validation features of the candidate subset
+            y_val: Validation labels
+            landmarks: Row indices of X_train used as landmarks
+            
+        Returns:
+            Accuracy score
+        """
+        S_train = kernel_computer._statevectors(X_train)
+        S_land = S_train[landmarks]
+        
+        # W^(-1/2) from the eigendecomposition, dropping numerically null directions
+        eigvals, eigvecs = np.linalg.eigh(fidelity_gram(S_land))
+        keep = eigvals > 1e-10 * eigvals[-1]
+        W_isqrt = eigvecs[:, keep] / np.sqrt(eigvals[keep])
+        
+        phi_train = fidelity_gram(S_train, S_land) @ W_isqrt
+        phi_val = fidelity_gram(kernel_computer._statevectors(X_val), S_land) @ W_isqrt
+        
+        svm = SVC(kernel='linear', C=self.C).fit(phi_train, y_train)
+        return accuracy_score(y_val, svm.predict(phi_val))
+    
     def fit(
         self,
         X_train: np.ndarray,
@@ -408,6 +855,14 @@ class QuantumFeatureSelector:
         X_test_subset = X_test[:, self.selected_features]
         return self.qsvm.predict(X_test_subset)
     
+    def decision_function(self, X_test: np.ndarray) -> np.ndarray:
+        """Decision values using QSVM with selected features"""
+        if self.qsvm is None:
+            raise ValueError("Model not trained. Call fit() first.")
+        
+        X_test_subset = X_test[:, self.selected_features]
+        return self.qsvm.decision_function(X_test_subset)
+    
     def predict_proba(self, X_test: np.ndarray) -> np.ndarray:
         """Predict probabilities using QSVM with selected features"""
         if self.qsvm is None:
@@ -425,7 +880,7 @@ if __name__ == "__main__":
     
     if not QISKIT_AVAILABLE:
         print("\n❌ Qiskit not available. Please install:")
-        print("pip install qiskit qiskit-aer qiskit-machine-learning")
+        print("pip install qiskit qiskit-aer")
     else:
         # Create synthetic fraud data for testing
         np.random.seed(42)
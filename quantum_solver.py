@@ -51,10 +51,12 @@ def load_dataset():
     data_dir = BASE_DIR / 'data' / 'processed'
     
     try:
-        X_train = np.load(data_dir / 'X_train_scaled.npy')
-        y_train = np.load(data_dir / 'y_train_resampled.npy')
-        X_test = np.load(data_dir / 'X_test_scaled.npy')
-        y_test = np.load(data_dir / 'y_test.npy')
+        # Memory-mapped: only the pages actually touched are read in. Feature
+        # selection and sampling below copy out the rows/columns they keep
+        X_train = np.load(data_dir / 'X_train_scaled.npy', mmap_mode='r')
+        y_train = np.load(data_dir / 'y_train_resampled.npy', mmap_mode='r')
+        X_test = np.load(data_dir / 'X_test_scaled.npy', mmap_mode='r')
+        y_test = np.load(data_dir / 'y_test.npy', mmap_mode='r')
         
         print(f"✓ Training samples: {X_train.shape[0]}")
         print(f"✓ Test samples: {X_test.shape[0]}")
@@ -150,8 +152,10 @@ def select_features(X_train, X_test, n_features=8):
         return X_train, X_test, list(range(X_train.shape[1]))
     
     # Simple variance-based feature selection
-    variances = np.var(X_train, axis=0)
-    top_indices = np.argsort(variances)[-n_features:]
+    variances = np.var(X_train, axis=0, dtype=np.float64)
+    # O(D) top-k selection, then order just those k by variance (ascending)
+    top_indices = np.argpartition(variances, -n_features)[-n_features:]
+    top_indices = top_indices[np.argsort(variances[top_indices])]
     
     X_train_selected = X_train[:, top_indices]
     X_test_selected = X_test[:, top_indices]
@@ -163,7 +167,7 @@ def select_features(X_train, X_test, n_features=8):
     return X_train_selected, X_test_selected, top_indices.tolist()
 
 
-def sample_for_quantum(X_train, y_train, max_samples=1000):
+def sample_for_quantum(X_train, y_train, max_samples=1000, seed=42):
     """
     Sample dataset for quantum training.
     Quantum kernel computation is expensive, so we use a subset.
@@ -184,11 +188,14 @@ def sample_for_quantum(X_train, y_train, max_samples=1000):
     n_fraud = min(len(fraud_indices), max_samples // 2)
     n_normal = max_samples - n_fraud
     
-    fraud_sample = np.random.choice(fraud_indices, n_fraud, replace=False)
-    normal_sample = np.random.choice(normal_indices, n_normal, replace=False)
+    # Generator.choice without replacement draws k indices without permuting
+    # the whole pool; the combined sample is shuffled once below
+    rng = np.random.default_rng(seed)
+    fraud_sample = rng.choice(fraud_indices, n_fraud, replace=False, shuffle=False)
+    normal_sample = rng.choice(normal_indices, n_normal, replace=False, shuffle=False)
     
     sample_indices = np.concatenate([fraud_sample, normal_sample])
-    np.random.shuffle(sample_indices)
+    rng.shuffle(sample_indices)
     
     X_sampled = X_train[sample_indices]
     y_sampled = y_train[sample_indices]
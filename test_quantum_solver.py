@@ -2,131 +2,499 @@
 """
 Quick test of quantum solver components
 Verifies all imports and basic functionality
+
+Usage:
+    python test_quantum_solver.py           # sequential, with summary
+    pytest -n auto test_quantum_solver.py   # one process per test (pytest-xdist)
+    python -X importtime test_quantum_solver.py 2> import.log   # import cost profile
+
+Transpiled feature maps are cached in ~/.cache/qsvm; set QSVM_CACHE_DIR to move
+the cache, or to an empty string to disable it.
 """
 
+import importlib
+import importlib.util
+import io
+import json
+import os
+import socket
 import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from functools import lru_cache
+from importlib.metadata import version as _pkg_version
 from pathlib import Path
+from time import perf_counter
+
+
+@lru_cache(maxsize=None)
+def _imp(name):
+    """Import a module once; later calls return the cached module object"""
+    return importlib.import_module(name)
+
+
+def _aer():
+    """qiskit_aer, or the legacy qiskit.providers.aer location for old installs"""
+    # find_spec only checks that the package exists, without raising a failed import
+    if importlib.util.find_spec("qiskit_aer") is not None:
+        return _imp("qiskit_aer")
+    return _imp("qiskit.providers.aer")
+
+
+@lru_cache(maxsize=None)
+def build_simulator():
+    """
+    Single-precision statevector AerSimulator, on the GPU (cuStateVec) when available.
+    
+    Built once per process and shared by the tests that need a backend.
+    
+    Returns:
+        AerSimulator instance
+    """
+    aer = _aer()
+    AerSimulator, AerError = aer.AerSimulator, aer.AerError
+    
+    try:
+        # Aer accepts device='GPU' even without CUDA support, so check the build first
+        if 'GPU' in AerSimulator().available_devices():
+            sim = AerSimulator(method="statevector", device="GPU", precision="single",
+                               cuStateVec_enable=True)
+            
+            # The first GPU job pays for CUDA context creation; take that hit here
+            # with a throwaway 1-qubit run so timed tests see steady-state cost
+            warm_up = _imp("qiskit").QuantumCircuit(1)
+            warm_up.measure_all()
+            sim.run(warm_up, shots=1).result()
+            return sim
+    except AerError:
+        pass
+    return AerSimulator(method="statevector", precision="single",
+                        max_parallel_threads=os.cpu_count())
+
+
+# Status markers: symbols on a terminal, plain ASCII for CI logs and pipes
+OK, FAIL, WARN = ("✓", "✗", "⚠️ ") if sys.stdout.isatty() else ("[OK]", "[FAIL]", "[WARN]")
+
+
+# Transpiled feature maps are kept here between runs. $QSVM_CACHE_DIR moves the
+# cache; setting it to an empty string turns it off
+_cache_dir = os.environ.get("QSVM_CACHE_DIR", str(Path.home() / ".cache" / "qsvm"))
+FEATURE_MAP_CACHE = Path(_cache_dir) if _cache_dir else None
+
+
+def load_feature_map(n_features, reps, backend):
+    """
+    ZZ feature map transpiled for backend, cached on disk as QPY between runs.
+    
+    A cache file that cannot be loaded (truncated, or written by another Qiskit)
+    is rebuilt and overwritten rather than failing the test.
+    
+    Args:
+        n_features: Number of features (qubits)
+        reps: Feature map repetitions
+        backend: Backend the circuit is transpiled for
+        
+    Returns:
+        Transpiled parametric QuantumCircuit
+    """
+    import qiskit
+    from qiskit import transpile, qpy
+    from qiskit.circuit.library import ZZFeatureMap
+    
+    def build():
+        return transpile(ZZFeatureMap(n_features, reps=reps), backend, optimization_level=3)
+    
+    if FEATURE_MAP_CACHE is None:
+        return build()
+    
+    # QPY files are only guaranteed to load with the Qiskit that wrote them
+    path = FEATURE_MAP_CACHE / f"fm_{n_features}_{reps}_{backend.name}_qiskit-{qiskit.__version__}.qpy"
+    try:
+        with open(path, 'rb') as f:
+            return qpy.load(f)[0]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"{WARN} Rebuilding unreadable feature map cache {path}: {e}")
+    
+    feature_map = build()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write beside the target and rename, so an interrupted run never leaves a partial file
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            qpy.dump(feature_map, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"{WARN} Could not write feature map cache {path}: {e}")
+    return feature_map
 
-print("=" * 70)
-print("QUANTUM SOLVER - QUICK TEST")
-print("=" * 70)
-print()
 
-# Test 1: Basic imports
-print("[1/5] Testing basic imports...")
-try:
+def test_basic_imports():
+    """[1/7] NumPy and scikit-learn"""
     import numpy as np
     import sklearn
-    print("✓ NumPy and scikit-learn imported")
-except ImportError as e:
-    print(f"✗ Error: {e}")
-    sys.exit(1)
-
-# Test 2: Qiskit imports
-print("\n[2/5] Testing Qiskit imports...")
-try:
-    import qiskit
-    print(f"✓ Qiskit version: {qiskit.__version__}")
+    print(f"{OK} NumPy and scikit-learn imported")
+
+
+def test_qiskit_imports():
+    """[2/7] Qiskit and Aer, plus a tiny kernel evaluation when Qiskit Machine Learning is installed"""
+    # Read from the installed distribution's metadata, without importing qiskit
+    print(f"{OK} Qiskit version: {_pkg_version('qiskit')}")
     
     # Try importing quantum components
     try:
         from qiskit import QuantumCircuit
     except ImportError:
         from qiskit.circuit import QuantumCircuit
-    print("✓ QuantumCircuit imported")
+    print(f"{OK} QuantumCircuit imported")
     
     from qiskit.circuit.library import ZZFeatureMap
-    print("✓ ZZFeatureMap imported")
+    print(f"{OK} ZZFeatureMap imported")
+    
+    # Shared by the QSVM test instead of a default (double-precision CPU) simulator
+    sim = build_simulator()
+    print(f"{OK} AerSimulator built: device={sim.options.device}, precision={sim.options.precision}")
     
+    # Evaluate a tiny kernel matrix end to end with the simulator settings above.
+    # The QSVM computes its own kernel, so Qiskit Machine Learning and Qiskit
+    # Algorithms are not requirements; without them this check only warns
+    import numpy as np
+    from qiskit_aer.primitives import Sampler as AerSampler
     try:
-        from qiskit_aer import AerSimulator
-    except ImportError:
-        from qiskit.providers.aer import AerSimulator
-    print("✓ AerSimulator imported")
+        from qiskit_machine_learning.kernels import FidelityQuantumKernel
+        from qiskit_algorithms.state_fidelities import ComputeUncompute
+    except ImportError as e:
+        print(f"{WARN} Skipping fidelity kernel check ({e.name} not installed)")
+        return
     
-    from qiskit_machine_learning.kernels import FidelityQuantumKernel
-    print("✓ FidelityQuantumKernel imported")
+    def evaluate_kernel(device):
+        # The primitive builds its own AerSimulator, configured like the shared one
+        options = {name: getattr(sim.options, name)
+                   for name in ("method", "precision", "cuStateVec_enable", "max_parallel_threads")}
+        options["device"] = device
+        options["cuStateVec_enable"] &= device == "GPU"
+        sampler = AerSampler(backend_options=options, run_options={"shots": None})
+        kernel = FidelityQuantumKernel(
+            feature_map=ZZFeatureMap(2, reps=1),
+            fidelity=ComputeUncompute(sampler=sampler)
+        )
+        start = perf_counter()
+        K = kernel.evaluate(np.random.rand(4, 2))
+        return K, (perf_counter() - start) * 1000
     
-except ImportError as e:
-    print(f"✗ Qiskit import error: {e}")
-    print("  Install with: pip install qiskit qiskit-aer qiskit-machine-learning")
-    sys.exit(1)
+    try:
+        K, kernel_ms = evaluate_kernel(sim.options.device)
+        print(f"{OK} 4x4 fidelity kernel on {sim.options.device}: {kernel_ms:.1f} ms")
+    except Exception as e:
+        print(f"{WARN} Kernel evaluation on {sim.options.device} failed ({e}); retrying on CPU")
+        K, kernel_ms = evaluate_kernel("CPU")
+        print(f"{OK} 4x4 fidelity kernel on CPU: {kernel_ms:.1f} ms (GPU path unavailable, expect slower fits)")
+    assert np.allclose(np.diag(K), 1.0, atol=1e-3), "kernel diagonal should be 1"
 
-# Test 3: Model imports
-print("\n[3/5] Testing model imports...")
-try:
-    sys.path.insert(0, str(Path(__file__).parent / 'model'))
-    
+
+def test_model_imports():
+    """[3/7] Project modules"""
+    # model/ is a package next to this script, so plain package imports work
+    # without touching sys.path (and keep the import finder caches valid)
     from model.qsvm_classifier import QSVM
-    print("✓ QSVM class imported")
+    print(f"{OK} QSVM class imported")
     
     from model.qcentroid_config import get_qcentroid_client
-    print("✓ QCentroid config imported")
+    print(f"{OK} QCentroid config imported")
     
     from model.evaluation_metrics import FraudDetectionMetrics
-    print("✓ Evaluation metrics imported")
-    
-except ImportError as e:
-    print(f"✗ Model import error: {e}")
-    sys.exit(1)
+    print(f"{OK} Evaluation metrics imported")
 
-# Test 4: Create small quantum circuit
-print("\n[4/5] Testing quantum circuit creation...")
-try:
-    # Create a simple 2-qubit circuit
-    feature_map = ZZFeatureMap(feature_dimension=2, reps=1)
-    print(f"✓ Created ZZ-FeatureMap: {feature_map.num_qubits} qubits")
+
+def test_circuit_creation():
+    """[4/7] Build and bind a small ZZ feature map"""
+    sim = build_simulator()
+    
+    # Create a simple 2-qubit circuit, transpiled once and reused across runs
+    feature_map = load_feature_map(2, 1, sim)
+    print(f"{OK} Created ZZ-FeatureMap: {feature_map.num_qubits} qubits, depth {feature_map.depth()}")
     
-    # Try to bind parameters (handle both Qiskit 0.x and 1.x)
+    # Bind parameters (the binder for the installed Qiskit is chosen once at import)
+    from model._compat import bind_params
     params = [0.5, 0.3]
-    try:
-        circuit = feature_map.assign_parameters(params)  # Qiskit 1.x
-    except (AttributeError, TypeError):
-        circuit = feature_map.bind_parameters(params)  # Qiskit 0.x
+    circuit = bind_params(feature_map, params)
+    
+    print(f"{OK} Bound parameters, circuit depth: {circuit.depth()}")
+    
+    # Per-sample binding (one circuit per row) vs. one Aer job binding all rows,
+    # the route model/qsvm_classifier.py uses for batched statevectors
+    import numpy as np
+    
+    template = feature_map.copy()
+    template.save_statevector()
+    fm_params = template.parameters
+    X = np.random.rand(100, 2)
+    
+    start = perf_counter()
+    circuits = [bind_params(template, dict(zip(fm_params, x))) for x in X]
+    per_point = sim.run(circuits).result()
+    per_point_ms = (perf_counter() - start) * 1000
     
-    print(f"✓ Bound parameters, circuit depth: {circuit.depth()}")
+    start = perf_counter()
+    binds = [{param: X[:, k].tolist() for k, param in enumerate(fm_params)}]
+    batched = sim.run(template, parameter_binds=binds).result()
+    batched_ms = (perf_counter() - start) * 1000
     
-except Exception as e:
-    print(f"✗ Circuit creation error: {e}")
-    sys.exit(1)
+    for i in (0, len(X) - 1):
+        assert np.allclose(per_point.data(i)['statevector'], batched.data(i)['statevector'], atol=1e-5), \
+            "batched parameter binding changed the statevectors"
+    print(f"{OK} 100 samples: per-sample binding {per_point_ms:.1f} ms, batched binding {batched_ms:.1f} ms")
+    if per_point_ms > 10 * batched_ms:
+        print(f"{WARN} Per-sample binding is >10x slower - bind batches with parameter_binds")
 
-# Test 5: Test QSVM instantiation
-print("\n[5/5] Testing QSVM instantiation...")
-try:
-    qsvm = QSVM(n_features=4, reps=1, C=1.0)
-    print("✓ QSVM instance created successfully")
+
+def test_qsvm_instantiation():
+    """[5/7] Construct a QSVM on the shared simulator"""
+    from qiskit.circuit.library import ZZFeatureMap
+    from model.qsvm_classifier import QSVM
+    
+    # Hand the QSVM an already-built feature map instead of having it synthesize another
+    sim = build_simulator()
+    feature_map = ZZFeatureMap(feature_dimension=4, reps=1)
+    qsvm = QSVM(n_features=4, C=1.0, backend=sim, feature_map=feature_map)
+    assert qsvm.feature_map is feature_map, "QSVM should reuse the given feature map"
+    print(f"{OK} QSVM instance created successfully")
     print(f"  - Features: {qsvm.n_features}")
     print(f"  - Regularization: {qsvm.C}")
+    assert qsvm.n_features == 4
+    
+    # The circuit the kernel runs is transpiled once at construction; it must already
+    # be in the simulator's native gates so Aer never re-synthesizes it per run
+    native = set(sim.configuration().basis_gates)
+    gates = {instruction.operation.name for instruction in qsvm.kernel_computer.feature_map.data}
+    assert gates <= native, f"feature map gates {sorted(gates - native)} are not native to the simulator"
+    print(f"  - Kernel circuit gates: {', '.join(sorted(gates))} (native to {sim.name})")
+
+
+def test_statevector_paths():
+    """[6/7] Closed-form statevectors match Qiskit's, and custom data maps fall back to Aer"""
+    import numpy as np
+    from qiskit.circuit.library import ZZFeatureMap
+    from qiskit.quantum_info import Statevector
+    from model.qsvm_classifier import QSVM
+    
+    def reference_kernel(feature_map, X):
+        states = np.array([Statevector(feature_map.assign_parameters(x)).data for x in X])
+        return np.abs(states.conj() @ states.T) ** 2
+    
+    X = np.random.default_rng(0).uniform(0, np.pi, (6, 3))
+    custom_map = ZZFeatureMap(3, reps=2, data_map_func=lambda x: np.pi * np.prod(np.sin(x)))
+    for name, feature_map in (("default", ZZFeatureMap(3, reps=2)), ("custom", custom_map)):
+        qsvm = QSVM(n_features=3, feature_map=feature_map, verbose=False)
+        K = qsvm.kernel_computer.compute_kernel_matrix(X)
+        error = np.abs(K - reference_kernel(feature_map, X)).max()
+        assert error < 1e-4, f"{name} data map kernel is off by {error:.3g}"
+        path = "closed form" if qsvm.encoder.closed_form else "Aer"
+        print(f"{OK} {name.capitalize()} data map via {path}: max kernel error {error:.1e}")
+    assert not qsvm.encoder.closed_form, "custom data_map_func must not use the closed form"
+
+
+def test_greedy_selection():
+    """[7/7] Greedy feature selection scores every candidate and keeps the best"""
+    import numpy as np
+    from model.qsvm_classifier import QuantumFeatureSelector
+    
+    class RecordingSelector(QuantumFeatureSelector):
+        def _nystrom_score(self, kernel_computer, X_train, y_train, X_val, y_val, landmarks):
+            score = super()._nystrom_score(kernel_computer, X_train, y_train, X_val, y_val, landmarks)
+            self.scores.append(score)
+            return score
+    
+    # Feature 0 is not the best one, so stopping at the first candidate that
+    # clears a threshold on step 1 would pick the wrong feature
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, np.pi, (160, 4))
+    y = (X[:, 3] > np.pi / 2).astype(int)
+    
+    selector = RecordingSelector(n_features=4, max_features=1, n_landmarks=32)
+    selector.scores = []
+    with redirect_stdout(io.StringIO()):
+        selected = selector.select_features_greedy(X[:120], y[:120], X[120:], y[120:])
+    
+    scores = selector.scores  # step 1 scans the features in order
+    assert len(scores) == 4, f"only {len(scores)} of 4 candidates were scored"
+    assert selected == [int(np.argmax(scores))], f"picked {selected}, scores {scores}"
+    print(f"{OK} Selected feature {selected[0]} of scores {', '.join(f'{s:.3f}' for s in scores)}")
+
+
+def call_with_timeout(func, timeout):
+    """
+    Run func() in a daemon thread and give up after timeout seconds.
+    
+    A daemon thread is used (rather than an executor) so a call that never
+    returns cannot keep the interpreter alive at exit.
+    
+    Raises:
+        TimeoutError: func did not finish in time
+    """
+    outcome = {}
     
-except Exception as e:
-    print(f"✗ QSVM instantiation error: {e}")
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
+    def target():
+        try:
+            outcome['value'] = func()
+        except BaseException as e:
+            outcome['error'] = e
+    
+    worker = threading.Thread(target=target, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise TimeoutError(f"no response within {timeout:g}s")
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['value']
+
 
-# Test 6: Optional - Test QCentroid connection
-print("\n[Optional] Testing QCentroid connection...")
-try:
+def check_qcentroid_connection(timeout=3.0):
+    """Optional: reach the QCentroid backend (needs credentials in .env)"""
+    # Bound any socket the client opens, so a blackholed endpoint fails fast
+    socket.setdefaulttimeout(timeout)
+    
     from dotenv import load_dotenv
     load_dotenv()
     
+    from model.qcentroid_config import get_qcentroid_client
     client = get_qcentroid_client()
-    backend_info = client.get_backend_info()
+    backend_info = call_with_timeout(client.get_backend_info, timeout)
     
-    print("✓ Connected to QCentroid!")
+    print(f"{OK} Connected to QCentroid!")
     print(f"  - Backend: {backend_info.get('backend', 'N/A')}")
     print(f"  - Type: {backend_info.get('type', 'N/A')}")
     print(f"  - Available: {backend_info.get('available', 'N/A')}")
+
+
+# (progress title, error label, test) in report order
+TESTS = [
+    ("[1/7] Testing basic imports...", "Error", test_basic_imports),
+    ("[2/7] Testing Qiskit imports...", "Qiskit import error", test_qiskit_imports),
+    ("[3/7] Testing model imports...", "Model import error", test_model_imports),
+    ("[4/7] Testing quantum circuit creation...", "Circuit creation error", test_circuit_creation),
+    ("[5/7] Testing QSVM instantiation...", "QSVM instantiation error", test_qsvm_instantiation),
+    ("[6/7] Testing statevector paths...", "Statevector path error", test_statevector_paths),
+    ("[7/7] Testing greedy feature selection...", "Feature selection error", test_greedy_selection),
+]
+
+# test -> test that must pass before it is started
+DEPENDS_ON = {
+    test_qsvm_instantiation: test_model_imports,
+    test_statevector_paths: test_model_imports,
+    test_greedy_selection: test_model_imports,
+}
+
+
+def run_captured(index):
+    """
+    Run TESTS[index], capturing everything it prints.
     
-except Exception as e:
-    print(f"⚠️  QCentroid connection failed (this is OK for testing): {e}")
-    print("   Set up .env file with credentials for quantum hardware access")
-
-# Summary
-print("\n" + "=" * 70)
-print("✅ ALL CORE TESTS PASSED!")
-print("=" * 70)
-print()
-print("The quantum solver is ready to run!")
-print("Execute with: python quantum_solver.py")
-print()
+    Args:
+        index: Position of the test in TESTS
+        
+    Returns:
+        (passed, captured output, duration in ms)
+    """
+    title, error_label, test = TESTS[index]
+    buf = io.StringIO()
+    start = perf_counter()
+    with redirect_stdout(buf):
+        print(f"\n{title}")
+        try:
+            test()
+            passed = True
+        except Exception as e:
+            passed = False
+            print(f"{FAIL} {error_label}: {e}")
+            if isinstance(e, ImportError):
+                print("  Install with: pip install -r requirements.txt")
+            else:
+                import traceback
+                traceback.print_exc(file=sys.stdout)  # keep it in order with the buffered report
+    return passed, buf.getvalue(), (perf_counter() - start) * 1000
+
+
+def write_results(results):
+    """Save per-test outcomes as JSON for automated regression tracking ($TEST_JSON)"""
+    with open(os.environ.get("TEST_JSON", "results.json"), "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def run_tests():
+    """Run the tests in parallel worker processes and report them in order"""
+    print("=" * 70)
+    print("QUANTUM SOLVER - QUICK TEST")
+    print("=" * 70)
+    
+    # Each worker pays its own import cost, so independent tests overlap
+    index_of = {test: i for i, (_, _, test) in enumerate(TESTS)}
+    with ProcessPoolExecutor(max_workers=min(len(TESTS), os.cpu_count() or 1)) as pool:
+        futures = {
+            i: pool.submit(run_captured, i)
+            for i, (_, _, test) in enumerate(TESTS) if test not in DEPENDS_ON
+        }
+        for test, dependency in DEPENDS_ON.items():
+            if futures[index_of[dependency]].result()[0]:
+                futures[index_of[test]] = pool.submit(run_captured, index_of[test])
+        
+        results = []
+        for i, (title, _, test) in enumerate(TESTS):
+            if i not in futures:
+                print(f"\n{title}\n{FAIL} Skipped: a test it depends on failed")
+                results.append({"name": test.__name__, "ok": False, "skipped": True, "t_ms": 0.0})
+                continue
+            passed, output, t_ms = futures[i].result()
+            sys.stdout.write(output)
+            results.append({"name": test.__name__, "ok": passed, "t_ms": round(t_ms, 3)})
+    
+    if not all(result["ok"] for result in results):
+        write_results(results)
+        return 1
+    
+    print("\n[Optional] Testing QCentroid connection...")
+    start = perf_counter()
+    connected = False
+    try:
+        check_qcentroid_connection()
+        connected = True
+    except TimeoutError as e:
+        print(f"{WARN} QCentroid connection timed out (this is OK for testing): {e}")
+        print("   Check network access to the QCentroid API")
+    except Exception as e:
+        print(f"{WARN} QCentroid connection failed (this is OK for testing): {e}")
+        print("   Set up .env file with credentials for quantum hardware access")
+    results.append({
+        "name": check_qcentroid_connection.__name__, "ok": connected, "optional": True,
+        "t_ms": round((perf_counter() - start) * 1000, 3)
+    })
+    write_results(results)
+    
+    # Summary
+    print("\n" + "=" * 70)
+    print(f"{OK} ALL CORE TESTS PASSED!")
+    print("=" * 70)
+    print()
+    print("The quantum solver is ready to run!")
+    print("Execute with: python quantum_solver.py")
+    print()
+    return 0
+
+
+def main():
+    """Run the tests, collecting their output and writing the report in one go"""
+    buf = io.StringIO()
+    try:
+        with redirect_stdout(buf):
+            return run_tests()
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    sys.exit(main())